@@ -1,17 +1,52 @@
 """Configuration classes for process orchestration."""
 
+import copy
+import functools
 import os
+import sys
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader
 
-@dataclass
+# Slotted dataclasses drop the per-instance __dict__ (Python 3.10+)
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# System metrics reported by ResourceMonitor.get_system_metrics
+SYSTEM_METRICS = ('cpu_percent', 'memory_percent', 'disk_percent')
+
+
+@functools.lru_cache(maxsize=8)
+def _load_yaml(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a YAML file.
+
+    The modification time and size are only used as part of the cache key,
+    so an unchanged file is parsed once.
+
+    Args:
+        path: Path to YAML file
+        mtime_ns: Modification time of the file in nanoseconds
+        size: Size of the file in bytes
+
+    Returns:
+        Parsed YAML data
+    """
+    del mtime_ns, size  # cache key only
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class BinaryConfig:
     """Binary configuration."""
     path: Optional[str] = None
     flags: List[str] = None
+    capture_output: bool = True
 
     def __post_init__(self):
         """Validate binary configuration."""
@@ -32,17 +67,34 @@ class BinaryConfig:
         Returns:
             List of command parts
         """
-        command = [self.path]
-        for flag in self.flags:
-            if '{input_file}' in flag:
-                flag = flag.replace('{input_file}', input_file)
-            if output_file is not None and '{output_file}' in flag:
-                flag = flag.replace('{output_file}', output_file)
-            command.append(flag)
-        return command
+        return [self.path] + [
+            self._substitute(flag, input_file, output_file)
+            for flag in self.flags
+        ]
+
+    @staticmethod
+    def _substitute(
+        flag: str, input_file: str, output_file: Optional[str]
+    ) -> str:
+        """Replace file placeholders in a single flag.
+
+        Args:
+            flag: Flag that may contain placeholders
+            input_file: Input file path
+            output_file: Optional output file path
+
+        Returns:
+            Flag with placeholders replaced
+        """
+        if '{' not in flag:
+            return flag
+        flag = flag.replace('{input_file}', input_file)
+        if output_file is not None:
+            flag = flag.replace('{output_file}', output_file)
+        return flag
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class DirectoryConfig:
     """Directory configuration."""
     input_file_list: Optional[str] = None
@@ -53,41 +105,73 @@ class DirectoryConfig:
         """Validate directory configuration."""
         if not self.input_file_list:
             raise ValueError("Input file list cannot be empty")
-        if not os.path.isfile(self.input_file_list):
-            raise FileNotFoundError(
-                f"Input file list not found: {self.input_file_list}"
-            )
         if not self.output_dir:
             raise ValueError("Output directory cannot be empty")
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
 
         # Convert None to empty string for easier comparison
         if self.output_suffix is None:
             self.output_suffix = ""
 
+    def validate(self) -> None:
+        """Check the configured paths on disk.
+
+        Filesystem checks are kept out of __post_init__ so constructing a
+        config stays cheap; call this before the paths are used.
+
+        Raises:
+            FileNotFoundError: If input file list not found
+        """
+        if not os.path.isfile(self.input_file_list):
+            raise FileNotFoundError(
+                f"Input file list not found: {self.input_file_list}"
+            )
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def iter_input_files(self) -> Iterator[str]:
+        """Iterate over the paths in the input file list.
+
+        The list is read lazily so large lists are never held in memory.
+
+        Yields:
+            Input file paths, skipping blank lines
+        """
+        with open(self.input_file_list, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
 
-@dataclass
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ResourceConfig:
     """Resource threshold configuration."""
     cpu_percent: float = 80.0
     memory_percent: float = 80.0
     disk_percent: float = 90.0
     max_processes: int = 2
+    collection_interval: float = 1.0
+    metric_intervals: Optional[Dict[str, float]] = None
 
     def __post_init__(self):
         """Validate resource configuration."""
-        if not 0 <= self.cpu_percent <= 100:
-            raise ValueError("CPU percent must be between 0 and 100")
-        if not 0 <= self.memory_percent <= 100:
-            raise ValueError("Memory percent must be between 0 and 100")
-        if not 0 <= self.disk_percent <= 100:
-            raise ValueError("Disk percent must be between 0 and 100")
+        if not 0 < self.cpu_percent <= 100:
+            raise ValueError("CPU percent must be above 0 and at most 100")
+        if not 0 < self.memory_percent <= 100:
+            raise ValueError("Memory percent must be above 0 and at most 100")
+        if not 0 < self.disk_percent <= 100:
+            raise ValueError("Disk percent must be above 0 and at most 100")
         if self.max_processes < 1:
             raise ValueError("Max processes must be at least 1")
+        if self.collection_interval < 0:
+            raise ValueError("Collection interval cannot be negative")
+        for name, interval in (self.metric_intervals or {}).items():
+            if name not in SYSTEM_METRICS:
+                raise ValueError(f"Unknown metric in metric_intervals: {name}")
+            if interval < 0:
+                raise ValueError(f"Interval for {name} cannot be negative")
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class OrchestratorOptions:
     """Combined options from command line and config file."""
     input_file_list: str
@@ -133,11 +217,35 @@ class OrchestratorOptions:
         )
 
 
-@dataclass
+def _coerce(value: Any, cls: type, name: str) -> Any:
+    """Convert a config section to its dataclass.
+
+    Args:
+        value: Section as a dict or an instance of cls
+        cls: Dataclass for the section
+        name: Section name used in the error message
+
+    Returns:
+        Instance of cls
+
+    Raises:
+        TypeError: If value is neither a dict nor an instance of cls
+    """
+    if isinstance(value, dict):
+        return cls(**value)
+    if isinstance(value, cls):
+        return value
+    raise TypeError(
+        f"{name} configuration must be a dict or {cls.__name__}"
+    )
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Config:
     """Configuration for process orchestration."""
     binary: BinaryConfig
     directories: DirectoryConfig
+    resources: ResourceConfig
 
     def __init__(self, **kwargs):
         """Initialize configuration.
@@ -149,36 +257,16 @@ class Config:
             ValueError: If configuration is invalid
             TypeError: If configuration type is invalid
         """
-        # Handle binary config
-        binary = kwargs.get('binary', {})
-        if isinstance(binary, dict):
-            self.binary = BinaryConfig(**binary)
-        elif isinstance(binary, BinaryConfig):
-            self.binary = binary
-        else:
-            raise TypeError(
-                "Binary configuration must be a dict or BinaryConfig"
-            )
-
-        # Handle directory config
-        directories = kwargs.get('directories', {})
-        if isinstance(directories, dict):
-            self.directories = DirectoryConfig(**directories)
-        elif isinstance(directories, DirectoryConfig):
-            self.directories = directories
-        else:
-            raise TypeError(
-                "Directory configuration must be a dict or DirectoryConfig"
-            )
+        self.binary = _coerce(kwargs.get('binary', {}), BinaryConfig, 'Binary')
+        self.directories = _coerce(
+            kwargs.get('directories', {}), DirectoryConfig, 'Directory'
+        )
 
-        # Handle resource config
+        # Fall back to defaults for missing or unrecognized resource config
         resources = kwargs.get('resources', {})
-        if isinstance(resources, dict):
-            self.resources = ResourceConfig(**resources)
-        elif isinstance(resources, ResourceConfig):
-            self.resources = resources
-        else:
-            self.resources = ResourceConfig()
+        if not isinstance(resources, (dict, ResourceConfig)):
+            resources = {}
+        self.resources = _coerce(resources, ResourceConfig, 'Resource')
 
     @classmethod
     def from_yaml(cls, config_path: str) -> 'Config':
@@ -197,7 +285,12 @@ class Config:
         if not os.path.isfile(config_path):
             raise FileNotFoundError(f"Config file not found: {config_path}")
 
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_data = yaml.safe_load(f)
+        stat = os.stat(config_path)
+        # Copy so callers can't mutate the cached data
+        config_data = copy.deepcopy(
+            _load_yaml(config_path, stat.st_mtime_ns, stat.st_size)
+        )
 
-        return cls(**config_data)
+        config = cls(**config_data)
+        config.directories.validate()
+        return config
@@ -2,20 +2,408 @@
 
 import logging
 import os
+import re
+import select
+import shlex
+import string
 import subprocess
-from typing import Dict, List, Optional, Tuple
+import threading
+from typing import BinaryIO, Dict, Iterable, List, Optional, Set, Tuple
 
 import psutil
 
-from orchestrator.config import Config
+from orchestrator.config import BinaryConfig, Config, DirectoryConfig
 from orchestrator.resource_monitor import ResourceMonitor
 from orchestrator.resource_calibration import ResourceCalibrator, NoopCalibrator, ProcessCalibrator
 
 logger = logging.getLogger(__name__)
 
+# Number of trailing output lines kept per stream for failure logs
+OUTPUT_TAIL_LINES = 200
+
+# Number of trailing output bytes kept per stream, so progress output that
+# never ends a line (such as ffmpeg's \r updates) stays bounded too
+OUTPUT_TAIL_BYTES = 64 * 1024
+
+# Size of each read from a process output pipe
+OUTPUT_READ_SIZE = 64 * 1024
+
+# Time given to each child to exit after SIGTERM before it is killed
+TERMINATE_TIMEOUT = 5.0  # seconds
+
+
+class _OutputTail:
+    """Bounded tail of a process output stream, filled by a daemon thread.
+
+    Draining the pipe while the process runs keeps a chatty child from
+    blocking on a full pipe buffer.
+    """
+
+    def __init__(
+        self,
+        pipe: BinaryIO,
+        max_lines: int = OUTPUT_TAIL_LINES,
+        max_bytes: int = OUTPUT_TAIL_BYTES
+    ):
+        """Start draining a pipe.
+
+        Args:
+            pipe: Output stream to drain; it is closed once drained
+            max_lines: Maximum number of trailing lines to keep
+            max_bytes: Maximum number of trailing bytes to keep
+        """
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self._buffer = bytearray()
+        self._thread = threading.Thread(
+            target=self._drain, args=(pipe, ), daemon=True
+        )
+        self._thread.start()
+
+    def _drain(self, pipe: BinaryIO) -> None:
+        """Read the pipe until EOF, keeping only the trailing bytes."""
+        try:
+            with pipe:
+                # Fixed-size reads, since a line may never end
+                for chunk in iter(lambda: pipe.read1(OUTPUT_READ_SIZE), b''):
+                    self._buffer += chunk
+                    if len(self._buffer) > self.max_bytes:
+                        del self._buffer[:-self.max_bytes]
+        except (OSError, ValueError) as e:
+            logger.debug("Stopped draining process output: %s", e)
+
+    def read(self, timeout: float = 1.0) -> str:
+        """Return the collected output once the pipe reaches EOF.
+
+        Args:
+            timeout: Maximum time to wait for the drain thread (seconds)
+
+        Returns:
+            Trailing lines of output
+        """
+        self._thread.join(timeout)
+        data = bytes(self._buffer)
+        # Find the start of the last max_lines lines, ignoring a final newline
+        start = len(data) - 1
+        for _ in range(self.max_lines):
+            start = data.rfind(b'\n', 0, start)
+            if start < 0:
+                break
+        # Output is kept as bytes and only decoded when it is logged
+        return data[start + 1:].decode('utf-8', errors='replace')
+
+
+# Flags that make the command run through the shell
+_SHELL_OPERATORS = frozenset(('>', '>>', '|', '<'))
+
+# Placeholders a flag may reference
+_FLAG_FIELDS = frozenset(('input_file', 'output_file'))
+
+
+def _check_flag(flag: str) -> None:
+    """Check that a flag only references known placeholders.
+
+    Args:
+        flag: Flag that may contain placeholders
+
+    Raises:
+        ValueError: If the flag is malformed or references an unknown field
+    """
+    for _, field_name, format_spec, _ in string.Formatter().parse(flag):
+        if field_name is None:
+            continue
+        # Attribute and index lookups start from the named field
+        root = re.split(r'[.\[]', field_name, maxsplit=1)[0]
+        if root not in _FLAG_FIELDS:
+            raise ValueError(
+                f"Unknown placeholder {{{field_name}}} in flag: {flag}"
+            )
+        if format_spec and '{' in format_spec:
+            # Nested fields such as {input_file:{width}}
+            _check_flag(format_spec)
+
+
+def _open_pidfd(pid: int) -> Optional[int]:
+    """Open a file descriptor that becomes readable when a process exits.
+
+    Args:
+        pid: Process ID
+
+    Returns:
+        The pidfd, or None if pidfds are unsupported (Python < 3.9,
+        Linux < 5.3 or another platform) or the process is gone
+    """
+    pidfd_open = getattr(os, 'pidfd_open', None)
+    if pidfd_open is None or not hasattr(select, 'poll'):
+        return None
+    try:
+        return pidfd_open(pid)
+    except OSError:
+        return None
+
+
+class _CommandLauncher:
+    """Builds and launches the configured command for input files."""
+
+    def __init__(self, binary: BinaryConfig, directories: DirectoryConfig):
+        """Precompute everything that is fixed per configuration.
+
+        Args:
+            binary: Binary configuration
+            directories: Directory configuration
+
+        Raises:
+            ValueError: If a binary flag references an unknown placeholder
+        """
+        self._path = binary.path
+        # Discard output entirely unless it is wanted for failure logs
+        self._capture_output = binary.capture_output
+        # Check placeholders once rather than failing on every command build
+        for flag in binary.flags:
+            _check_flag(flag)
+        self._flags = list(binary.flags)
+        # Shell operators are literal flags, so this is fixed per config
+        self.use_shell = any(flag in _SHELL_OPERATORS for flag in binary.flags)
+        # Precompute the parts of every output path
+        self._out_prefix = os.path.join(directories.output_dir, '')
+        self._suffix = directories.output_suffix or ''
+        # A suffix with a separator puts each output in its own subdirectory
+        self._output_dirs: Optional[Set[str]] = (
+            set() if os.sep in self._suffix else None
+        )
+        # Output tails of launched processes that capture output
+        self.output: Dict[str, Tuple[_OutputTail, _OutputTail]] = {}
+
+    def output_path(self, input_file: str) -> str:
+        """Get the output path for an input file.
+
+        Args:
+            input_file: Input file path
+
+        Returns:
+            Path in the output directory with the configured suffix
+        """
+        return self._out_prefix + os.path.basename(input_file) + self._suffix
+
+    def ensure_output_parent(self, input_file: str) -> None:
+        """Create the parent directory of an output path, once per directory.
+
+        Nothing is created unless the suffix contains a separator.
+
+        Args:
+            input_file: Input file path
+        """
+        if self._output_dirs is None:
+            return
+        parent = os.path.dirname(self.output_path(input_file))
+        if parent not in self._output_dirs:
+            os.makedirs(parent, exist_ok=True)
+            self._output_dirs.add(parent)
+
+    def build(self, input_file: str) -> Tuple[object, bool]:
+        """Build the command for an input file.
+
+        Args:
+            input_file: Input file path
+
+        Returns:
+            A tuple of (command, use_shell) where command is either a list or a string
+        """
+        values = {
+            'input_file': input_file,
+            'output_file': self.output_path(input_file)
+        }
+        formatted_flags = [flag.format(**values) for flag in self._flags]
+
+        if self.use_shell:
+            # Build a command string for shell execution
+            return self._path + " " + " ".join(formatted_flags), True
+        return [self._path] + formatted_flags, False
+
+    def launch(self, input_file: str, cmd: object) -> subprocess.Popen:
+        """Launch a built command, draining its output if it is captured.
+
+        Args:
+            input_file: Input file path
+            cmd: Command from build()
+
+        Returns:
+            Process object
+        """
+        output = (
+            subprocess.PIPE if self._capture_output else subprocess.DEVNULL
+        )
+        # pylint: disable=consider-using-with
+        process = subprocess.Popen(
+            cmd,
+            stdout=output,
+            stderr=output,
+            close_fds=True,
+            shell=self.use_shell
+        )
+        if self._capture_output:
+            self.output[input_file] = (
+                _OutputTail(process.stdout), _OutputTail(process.stderr)
+            )
+        return process
+
+
+class _ChildWatcher:
+    """Wakes the run loop when a child exits or a stop is requested.
+
+    Children are watched through pidfds where the platform supports them,
+    and through a thread blocked in wait() otherwise.
+    """
+
+    def __init__(self):
+        """Create a watcher with nothing to watch yet."""
+        # Set whenever a child exits, so run() can block instead of spinning
+        # on poll()
+        self.child_exited = threading.Event()
+        self.shutdown = threading.Event()
+        # Exit notification through pidfds, set up on first use
+        self.pidfds: Dict[str, int] = {}
+        self._pidfd_files: Dict[int, str] = {}
+        # Files whose pidfd reported an exit that has not been checked yet
+        self._exited: Set[str] = set()
+        # Set when a wait times out, so every process gets polled even if
+        # its pidfd never signals
+        self._timed_out = False
+        self._poller = None
+        self._wake_fds: Optional[Tuple[int, int]] = None
+
+    def watch(self, input_file: str, process: subprocess.Popen) -> None:
+        """Arrange for the run loop to wake up when the process exits.
+
+        Args:
+            input_file: Input file path
+            process: Process object to watch
+        """
+        pidfd = _open_pidfd(process.pid)
+        if pidfd is None:
+            watcher = threading.Thread(
+                target=self._wait_for_exit, args=(process, ), daemon=True
+            )
+            watcher.start()
+            return
+
+        if self._poller is None:
+            self._poller = select.poll()
+            self._wake_fds = os.pipe()
+            os.set_blocking(self._wake_fds[0], False)
+            os.set_blocking(self._wake_fds[1], False)
+            self._poller.register(self._wake_fds[0], select.POLLIN)
+        self._poller.register(pidfd, select.POLLIN)
+        self.pidfds[input_file] = pidfd
+        self._pidfd_files[pidfd] = input_file
+
+    def unwatch(self, input_file: str) -> None:
+        """Stop watching the process for an input file.
+
+        Args:
+            input_file: Input file path
+        """
+        pidfd = self.pidfds.pop(input_file, None)
+        if pidfd is not None:
+            del self._pidfd_files[pidfd]
+            self._poller.unregister(pidfd)
+            os.close(pidfd)
+        self._exited.discard(input_file)
+
+    def close(self) -> None:
+        """Close any remaining pidfds and the wake-up pipe."""
+        for input_file in list(self.pidfds):
+            self.unwatch(input_file)
+        if self._wake_fds is not None:
+            for fd in self._wake_fds:
+                os.close(fd)
+        self._poller = None
+        self._wake_fds = None
+
+    def _wait_for_exit(self, process: subprocess.Popen) -> None:
+        """Block until the process exits, then wake up the run loop.
+
+        Args:
+            process: Process object to wait for
+        """
+        try:
+            process.wait()
+        except Exception as e:  # pylint: disable=broad-except
+            logger.debug("Failed to wait for process: %s", e)
+        finally:
+            self.wake()
+
+    def wake(self) -> None:
+        """Wake up the run loop if it is waiting for children."""
+        self.child_exited.set()
+        if self._wake_fds is not None:
+            try:
+                os.write(self._wake_fds[1], b'\0')
+            except OSError:
+                # Pipe is full (a wake-up is already pending) or closed
+                pass
+
+    def wait(self, timeout: float) -> None:
+        """Wait until a child exits, wake() is called or the timeout elapses.
+
+        Args:
+            timeout: Maximum time to wait (seconds)
+        """
+        if not self.pidfds:
+            self.child_exited.wait(timeout=timeout)
+            return
+        if self.child_exited.is_set():
+            return
+
+        events = self._poller.poll(timeout * 1000)
+        if not events:
+            self._timed_out = True
+        for fd, _ in events:
+            if fd == self._wake_fds[0]:
+                try:
+                    os.read(fd, 4096)
+                except BlockingIOError:
+                    pass
+            else:
+                self._exited.add(self._pidfd_files[fd])
+
+    def to_check(
+        self, processes: Dict[str, subprocess.Popen]
+    ) -> List[Tuple[str, subprocess.Popen]]:
+        """Get the processes that may have exited since the last check.
+
+        Processes watched through a pidfd are only included once the poller
+        has reported their exit, or after a wait timed out.
+
+        Args:
+            processes: Running processes by input file
+
+        Returns:
+            List of (input_file, process) pairs
+        """
+        if not self.pidfds:
+            return list(processes.items())
+        exited, self._exited = self._exited, set()
+        if self._timed_out:
+            self._timed_out = False
+            return list(processes.items())
+        if len(self.pidfds) == len(processes):
+            # Every running process has a pidfd, so only visit the exited ones
+            return [(input_file, processes[input_file])
+                    for input_file in exited
+                    if input_file in processes]
+        return [(input_file, process)
+                for input_file, process in processes.items()
+                if input_file in exited or input_file not in self.pidfds]
+
 
 class ProcessManager:
-    """Process manager for orchestrating file processing."""
+    """Process manager for orchestrating file processing.
+
+    The binary settings and the output location are read once at
+    construction, so later changes to them are not picked up. The input
+    file list is read when run() is called.
+    """
 
     def __init__(
         self,
@@ -30,13 +418,23 @@ class ProcessManager:
             config: Configuration object
             calibrator: Optional resource calibrator. If None, uses NoopCalibrator.
             skip_calibration: Whether to skip resource calibration
+
+        Raises:
+            ValueError: If a binary flag references an unknown placeholder
         """
         self.config = config
+        # Check the input list and create the output directory once rather
+        # than on every process start
+        config.directories.validate()
+        self._launcher = _CommandLauncher(config.binary, config.directories)
         self.processes: Dict[str, subprocess.Popen] = {}
         self.completed_files: List[str] = []
         self.failed_files: List[str] = []
+        # Every file in completed_files or failed_files, for O(1) lookups
+        self._finished: Set[str] = set()
         self.retry_counts: Dict[str, int] = {}
         self.max_retries = 3
+        self._watcher = _ChildWatcher()
 
         # Initialize with default thresholds
         thresholds = {
@@ -50,15 +448,19 @@ class ProcessManager:
         self.calibrator = calibrator or (
             NoopCalibrator() if skip_calibration else ProcessCalibrator(config)
         )
-        input_files = self._get_input_files()
-        if input_files and not skip_calibration:
-            calibrated = self.calibrator.calibrate(input_files[0])
+        first_file = None
+        if not skip_calibration:
+            first_file = next(config.directories.iter_input_files(), None)
+        if first_file is not None:
+            calibrated = self.calibrator.calibrate(first_file)
             if calibrated:
                 thresholds.update(calibrated)
 
         self.resource_monitor = ResourceMonitor(
             thresholds=thresholds,
-            output_dir=self.config.directories.output_dir
+            output_dir=self.config.directories.output_dir,
+            collection_interval=config.resources.collection_interval,
+            metric_intervals=config.resources.metric_intervals
         )
 
     def build_command(self, input_file: str) -> Tuple[object, bool]:
@@ -70,37 +472,7 @@ class ProcessManager:
         Returns:
             A tuple of (command, use_shell) where command is either a list or a string, and use_shell indicates whether shell=True should be used.
         """
-        # Get output path with suffix
-        output_file = os.path.join(
-            self.config.directories.output_dir,
-            os.path.basename(input_file) + self.config.directories.output_suffix
-        )
-
-        # Format flags with substitution
-        formatted_flags = [
-            flag.format(input_file=input_file, output_file=output_file)
-            for flag in self.config.binary.flags
-        ]
-
-        # Check if any flag contains shell operators that require shell interpretation
-        if any(op in formatted_flags for op in [">", ">>", "|", "<"]):
-            # Build a command string for shell execution
-            cmd_str = self.config.binary.path + " " + " ".join(formatted_flags)
-            logger.info("Built shell command: %s", cmd_str)
-            return cmd_str, True
-        cmd_list = [self.config.binary.path] + formatted_flags
-        logger.info("Built command: %s", ' '.join(cmd_list))
-        return cmd_list, False
-
-    def _get_input_files(self) -> List[str]:
-        """Get list of input files.
-
-        Returns:
-            List of input file paths
-        """
-        with open(self.config.directories.input_file_list, 'r',
-                  encoding='utf-8') as f:
-            return [line.strip() for line in f if line.strip()]
+        return self._launcher.build(input_file)
 
     def start_process(self, input_file: str) -> Optional[subprocess.Popen]:
         """Start a new process.
@@ -118,52 +490,122 @@ class ProcessManager:
         if input_file in self.processes:
             logger.warning("File %s is already being processed", input_file)
             return None
-        if input_file in self.completed_files:
-            logger.warning("File %s has already been processed", input_file)
-            return None
-        if input_file in self.failed_files:
-            logger.warning("File %s has already failed", input_file)
+        if input_file in self._finished:
+            if input_file in self.failed_files:
+                logger.warning("File %s has already failed", input_file)
+            else:
+                logger.warning(
+                    "File %s has already been processed", input_file
+                )
             return None
 
         if not os.path.isfile(input_file):
             raise FileNotFoundError(f"Input file not found: {input_file}")
 
-        # Build command and determine if shell should be used
-        cmd, use_shell = self.build_command(input_file)
+        self._launcher.ensure_output_parent(input_file)
 
-        # Create output directory if it doesn't exist
-        output_dir = os.path.dirname(cmd[-1] if isinstance(cmd, list) else cmd)
-        os.makedirs(output_dir, exist_ok=True)
+        # Build command
+        try:
+            cmd, _ = self.build_command(input_file)
+        except (LookupError, AttributeError, TypeError, ValueError) as e:
+            logger.error(
+                "Failed to build command for file %s: %s", input_file, e
+            )
+            self._mark_failed(input_file)
+            return None
 
         # Start process
         logger.info("Starting process for file: %s", input_file)
-        logger.info(
-            "Command: %s", ' '.join(cmd) if isinstance(cmd, list) else cmd
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Command: %s", shlex.join(cmd) if isinstance(cmd, list) else cmd
+            )
 
         try:
-            # pylint: disable=consider-using-with
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                close_fds=True,
-                shell=use_shell
-            )
+            process = self._launcher.launch(input_file, cmd)
             self.processes[input_file] = process
             self.resource_monitor.add_process(
                 input_file, psutil.Process(process.pid)
             )
+            self._watcher.watch(input_file, process)
             return process
         except Exception as e:
             logger.error(
                 "Failed to start process for file %s: %s", input_file, e
             )
-            self.failed_files.append(input_file)
+            self._mark_failed(input_file)
             return None
 
+    def _wait_for_children(self) -> None:
+        """Wait until a child exits, shutdown is requested or the monitoring
+        interval elapses, whichever comes first."""
+        self._watcher.wait(self.resource_monitor.monitoring_interval)
+
+    def stop(self) -> None:
+        """Request the run loop to stop.
+
+        The loop stops scheduling new processes, then terminates and reaps
+        the running ones before run() returns.
+        """
+        self._watcher.shutdown.set()
+        self._watcher.wake()
+
+    def close(self) -> None:
+        """Release the file descriptors used to watch child processes.
+
+        run() and run_batch() release them when they return; callers that
+        use start_process() directly should call this once they are done.
+        Running processes are left alone.
+        """
+        self._watcher.close()
+
+    def _terminate_processes(self) -> None:
+        """Terminate all running processes and wait for them to exit.
+
+        Processes that do not exit within TERMINATE_TIMEOUT are killed.
+        """
+        for input_file, process in list(self.processes.items()):
+            logger.info("Terminating process for file: %s", input_file)
+            try:
+                process.terminate()
+            except OSError as e:
+                logger.error(
+                    "Failed to terminate process for file %s: %s", input_file,
+                    e
+                )
+
+        for input_file, process in list(self.processes.items()):
+            try:
+                process.wait(timeout=TERMINATE_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                logger.warning(
+                    "Process for file %s did not exit, killing it", input_file
+                )
+                process.kill()
+                process.wait()
+            del self.processes[input_file]
+            self._launcher.output.pop(input_file, None)
+            self.resource_monitor.remove_process(input_file)
+            self._watcher.unwatch(input_file)
+
+    def _mark_completed(self, input_file: str) -> None:
+        """Record that a file was processed successfully.
+
+        Args:
+            input_file: Input file path
+        """
+        self.completed_files.append(input_file)
+        self._finished.add(input_file)
+
+    def _mark_failed(self, input_file: str) -> None:
+        """Record that a file failed processing.
+
+        Args:
+            input_file: Input file path
+        """
+        self.failed_files.append(input_file)
+        self._finished.add(input_file)
+
     def _check_process(self, input_file: str,
                        process: subprocess.Popen) -> Optional[bool]:
         """Check process status.
@@ -182,16 +624,19 @@ class ProcessManager:
             return None
 
         # Process finished
-        stdout, stderr = process.communicate()
+        output = self._launcher.output.pop(input_file, None)
 
         if return_code == 0:
             logger.info(
                 "Process completed successfully for file: %s", input_file
             )
             # Process completed successfully
-            self.completed_files.append(input_file)
+            self._mark_completed(input_file)
             return True
 
+        stdout = stderr = ''
+        if output:
+            stdout, stderr = output[0].read(), output[1].read()
         logger.error(
             "Process failed for file %s with return code %d\nStdout:\n%s\nStderr:\n%s",
             input_file, return_code, stdout or "<no output>", stderr
@@ -215,7 +660,7 @@ class ProcessManager:
             logger.error(
                 "Max retries reached for file %s, marking as failed", input_file
             )
-            self.failed_files.append(input_file)
+            self._mark_failed(input_file)
             return False
 
         # Process failed but can be retried
@@ -224,87 +669,96 @@ class ProcessManager:
     def _check_processes(self) -> None:
         """Check status of all running processes."""
         # Get a list of current processes to avoid modifying during iteration
-        current_processes = list(self.processes.items())
-        finished = []
+        current_processes = self._watcher.to_check(self.processes)
         needs_retry = []
 
         # Check each process
         for input_file, process in current_processes:
+            retries = self.retry_counts.get(input_file, 0)
             result = self._check_process(input_file, process)
-            if result is True:
-                # Process completed successfully
-                finished.append(input_file)
-            elif result is False:
-                # Process failed and hit max retries
-                finished.append(input_file)
-            elif result is None and input_file not in self.completed_files:
-                # Process still running
-                continue
+            if result is None:
+                if self.retry_counts.get(input_file, 0) == retries:
+                    # Process still running
+                    continue
+                # Process failed but can be retried
+                needs_retry.append(input_file)
 
             # Clean up process if it's done
             if input_file in self.processes:
                 del self.processes[input_file]
                 self.resource_monitor.remove_process(input_file)
+                self._watcher.unwatch(input_file)
 
-            # Add to retry list if needed
-            if result is False and self.retry_counts[input_file
-                                                     ] < self.max_retries:
-                needs_retry.append(input_file)
-
-        # Retry failed processes that haven't hit max retries
+        # Restart failed processes that haven't hit max retries
         for input_file in needs_retry:
-            if input_file not in self.failed_files:
-                process = self.start_process(input_file)
-                if process:
-                    self.processes[input_file] = process
+            self.start_process(input_file)
 
     def run(self) -> int:
-        """Run process manager.
+        """Run process manager over the configured input file list.
 
         Returns:
             Exit code (0 for success, non-zero for failure)
         """
-        input_files = self._get_input_files()
-        total_files = len(input_files)
-        current_index = 0
-
-        logger.info("Starting process manager with %d files", total_files)
-
-        while (current_index < total_files or self.processes):
-            # Check running processes
-            self._check_processes()
-
-            # Start new processes if resources available
-            while (current_index < total_files
-                   and self.resource_monitor.can_start_new_process()):
-                input_file = input_files[current_index]
-                # Skip if file is already being processed or has been processed
-                if input_file in self.processes:
-                    current_index += 1
-                    continue
+        logger.info(
+            "Starting process manager with input file list %s",
+            self.config.directories.input_file_list
+        )
+        return self.run_batch(self.config.directories.iter_input_files())
 
-                if input_file in self.completed_files or input_file in self.failed_files:
-                    current_index += 1
-                    continue
+    def run_batch(self, input_files: Iterable[str]) -> int:
+        """Process a batch of input files concurrently.
 
-                # Initialize retry count if not already set
-                if input_file not in self.retry_counts:
-                    self.retry_counts[input_file] = 0
-
-                process = self.start_process(input_file)
-                if process:
-                    self.processes[input_file] = process
-                    current_index += 1
-                elif self.retry_counts[input_file] >= self.max_retries:
-                    # If we've hit max retries, mark as failed and move on
-                    self.failed_files.append(input_file)
-                    current_index += 1
-
-            # If no processes are running and we can't start new ones, we're done
-            if not self.processes and (
-                    current_index >= total_files
-                    or not self.resource_monitor.can_start_new_process()):
-                break
+        Files are consumed from the iterable only as capacity to start them
+        becomes available.
+
+        Args:
+            input_files: Input file paths to process
+
+        Returns:
+            Exit code (0 for success, non-zero for failure)
+        """
+        pending = iter(input_files)
+        input_file = next(pending, None)
+        total_files = 0
+
+        try:
+            while ((input_file is not None or self.processes)
+                   and not self._watcher.shutdown.is_set()):
+                # Clear before checking so an exit during the check is not lost
+                self._watcher.child_exited.clear()
+
+                # Check running processes
+                self._check_processes()
+
+                # Start new processes if resources available
+                while (input_file is not None
+                       and self.resource_monitor.can_start_new_process()):
+                    total_files += 1
+                    # Skip if file is already being processed or has been processed
+                    if (input_file not in self.processes
+                            and input_file not in self._finished):
+                        # Initialize retry count if not already set
+                        if input_file not in self.retry_counts:
+                            self.retry_counts[input_file] = 0
+                        self.start_process(input_file)
+                    input_file = next(pending, None)
+
+                # If no processes are running and we can't start new ones, we're done
+                if not self.processes and (
+                        input_file is None
+                        or not self.resource_monitor.can_start_new_process()):
+                    break
+
+                # Block until a child exits instead of spinning on poll()
+                self._wait_for_children()
+        except KeyboardInterrupt:
+            logger.warning("Interrupted, terminating running processes")
+            self._watcher.shutdown.set()
+            raise
+        finally:
+            # Left over only when stopped or interrupted
+            self._terminate_processes()
+            self._watcher.close()
 
         # Log final status
         logger.info("Process manager finished")
@@ -312,11 +766,10 @@ class ProcessManager:
         logger.info("Failed files: %d", len(self.failed_files))
 
         # Return non-zero exit code if any files failed or not all files were processed
-        total_files = len(input_files)
         if len(self.failed_files) > 0:
             logger.error("Some files failed processing")
             return 1
-        if len(self.completed_files) < total_files:
+        if input_file is not None or len(self.completed_files) < total_files:
             logger.error("Not all files were processed")
             return 1
         return 0
@@ -13,6 +13,11 @@ from orchestrator.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Number of CPU samples taken during calibration, and the default time
+# between them
+CALIBRATION_SAMPLES = 4
+CALIBRATION_SAMPLE_INTERVAL = 0.1  # seconds
+
 
 class ResourceCalibrator(ABC):
     """Interface for resource calibration."""
@@ -48,15 +53,22 @@ class NoopCalibrator(ResourceCalibrator):
 class ProcessCalibrator(ResourceCalibrator):
     """Calibrator that measures resource usage of test processes."""
 
-    def __init__(self, config: Config, skip_calibration: bool = False) -> None:
+    def __init__(
+        self,
+        config: Config,
+        skip_calibration: bool = False,
+        sample_interval: float = CALIBRATION_SAMPLE_INTERVAL
+    ) -> None:
         """Initialize calibrator.
 
         Args:
             config: Configuration object
             skip_calibration: Whether to skip calibration and use default thresholds
+            sample_interval: Time between CPU samples (seconds)
         """
         self.config = config
         self.skip_calibration = skip_calibration
+        self.sample_interval = sample_interval
 
     def start_process(self, input_file: str) -> Optional[subprocess.Popen]:
         """Start a calibration process.
@@ -73,16 +85,94 @@ class ProcessCalibrator(ResourceCalibrator):
 
         try:
             command = self.config.binary.build_command(input_file)
-            with subprocess.Popen(command, stdin=subprocess.PIPE,
-                                  stdout=subprocess.PIPE,
-                                  stderr=subprocess.PIPE, text=True) as process:
-                # Keep process open for calibration
-                process.poll()
-                return process
+            # The process must outlive this call, so it is not used as a
+            # context manager; calibrate() terminates and reaps it. Output is
+            # never read, so discard it rather than let a chatty child block
+            # on a full pipe while it is being measured.
+            # pylint: disable=consider-using-with
+            return subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
         except (subprocess.SubprocessError, OSError) as e:
             logger.error("Failed to start process: %s", e)
             return None
 
+    def _sample_cpu_percent(self, proc: psutil.Process) -> float:
+        """Measure the average CPU usage of a process.
+
+        The first cpu_percent() call only primes psutil's baseline; each later
+        call reports usage since the previous one.
+
+        Args:
+            proc: Process to measure
+
+        Returns:
+            Mean CPU usage over the samples (percentage)
+
+        Raises:
+            psutil.NoSuchProcess: If the process exits while being sampled
+        """
+        proc.cpu_percent()
+        samples = []
+        # Sleep until fixed deadlines so oversleeping does not accumulate
+        deadline = time.monotonic()
+        for _ in range(CALIBRATION_SAMPLES):
+            deadline += self.sample_interval
+            time.sleep(max(0.0, deadline - time.monotonic()))
+            samples.append(proc.cpu_percent())
+        return sum(samples) / len(samples)
+
+    @staticmethod
+    def compute_thresholds(
+        cpu_percent: float, *, process_memory: int, output_size: int,
+        cpu_count: Optional[int], total_memory: int, available_space: int
+    ) -> Dict[str, float]:
+        """Derive resource thresholds from calibration measurements.
+
+        Args:
+            cpu_percent: Mean CPU usage of the test process (percentage)
+            process_memory: Resident memory of the test process in bytes
+            output_size: Size of the test file in bytes
+            cpu_count: Number of CPUs, or None if unknown
+            total_memory: Total system memory in bytes
+            available_space: Free space in the output directory in bytes
+
+        Returns:
+            Dictionary of calibrated thresholds
+        """
+        cpu_count = cpu_count or 1  # Default to 1 if CPU count not available
+
+        # Calculate max processes based on CPU (leave 20% headroom)
+        max_processes_cpu = max(1, int(cpu_count * 0.8))
+
+        # Calculate max processes based on memory (leave 20% headroom)
+        process_memory = max(process_memory, 1024)  # Minimum 1KB
+        max_processes_memory = max(
+            1, int((total_memory * 0.8) / process_memory)
+        )
+
+        # Calculate max processes based on disk space (leave 20% headroom)
+        max_processes_disk = max(
+            1, int((available_space * 0.8) / output_size)
+        )
+
+        # Use minimum of CPU, memory and disk constraints
+        max_processes = min(
+            max_processes_cpu, max_processes_memory, max_processes_disk
+        )
+
+        # Set thresholds based on calibration
+        return {
+            'cpu_percent': max(1.0, cpu_percent) *
+                           1.2,  # Add 20% headroom, minimum 1% CPU
+            'memory_percent': (process_memory / total_memory) * 100 * 1.2,
+            'disk_percent': (output_size / available_space) * 100 * 1.2,
+            'max_processes': max_processes
+        }
+
     def calibrate(self, test_file: str) -> Optional[Dict[str, float]]:
         """Run calibration on a test file.
 
@@ -100,81 +190,28 @@ class ProcessCalibrator(ResourceCalibrator):
             logger.error("Failed to start calibration process")
             return None
 
-        # Give the process a moment to start
-        time.sleep(0.1)
-
-        # Monitor process until resource usage stabilizes
+        # Popen returns once the child has been exec'd, so sampling can start
+        # right away; the first sample interval covers the process startup
         try:
             proc = psutil.Process(process.pid)
         except psutil.NoSuchProcess:
             logger.error("Process terminated before monitoring could start")
             return None
 
-        last_cpu = 0
-        stable_count = 0
-        max_attempts = 10
-        attempt = 0
-
-        while attempt < max_attempts:
-            try:
-                with proc.oneshot():
-                    current_cpu = proc.cpu_percent()
-                    if abs(current_cpu -
-                           last_cpu) < 1.0:  # CPU usage change less than 1%
-                        stable_count += 1
-                        if stable_count >= 3:  # Stable for 3 consecutive checks
-                            break
-                    else:
-                        stable_count = 0
-                    last_cpu = current_cpu
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                logger.error("Process ended before stabilizing")
-                return None
-            attempt += 1
-
-        # Get process resource usage
         try:
-            proc = psutil.Process(process.pid)
-            with proc.oneshot():
-                cpu_percent = proc.cpu_percent(interval=1.0)
-                memory_info = proc.memory_info()
-
-            # Get system info
-            cpu_count = psutil.cpu_count(
-            ) or 1  # Default to 1 if CPU count not available
-            total_memory = psutil.virtual_memory().total
-            disk_usage = psutil.disk_usage(self.config.directories.output_dir)
-
-            # Calculate max processes based on CPU (leave 20% headroom)
-            max_processes_cpu = max(1, int(cpu_count * 0.8))
-
-            # Calculate max processes based on memory (leave 20% headroom)
-            process_memory = max(memory_info.rss, 1024)  # Minimum 1KB
-            max_processes_memory = max(
-                1, int((total_memory * 0.8) / process_memory)
-            )
-
-            # Calculate max processes based on disk space (leave 20% headroom)
-            output_size = os.path.getsize(test_file)
-            available_space = disk_usage.free
-            max_processes_disk = max(
-                1, int((available_space * 0.8) / output_size)
+            cpu_percent = self._sample_cpu_percent(proc)
+            memory_info = proc.memory_info()
+            return self.compute_thresholds(
+                cpu_percent=cpu_percent,
+                process_memory=memory_info.rss,
+                output_size=os.path.getsize(test_file),
+                cpu_count=psutil.cpu_count(),
+                total_memory=psutil.virtual_memory().total,
+                available_space=psutil.disk_usage(
+                    self.config.directories.output_dir
+                ).free
             )
 
-            # Use minimum of CPU, memory and disk constraints
-            max_processes = min(
-                max_processes_cpu, max_processes_memory, max_processes_disk
-            )
-
-            # Set thresholds based on calibration
-            return {
-                'cpu_percent': max(1.0, cpu_percent) *
-                               1.2,  # Add 20% headroom, minimum 1% CPU
-                'memory_percent': (process_memory / total_memory) * 100 * 1.2,
-                'disk_percent': (output_size / available_space) * 100 * 1.2,
-                'max_processes': max_processes
-            }
-
         except (psutil.NoSuchProcess, psutil.AccessDenied, OSError) as e:
             logger.error("Failed to get resource usage: %s", e)
             return None
@@ -184,5 +221,8 @@ class ProcessCalibrator(ResourceCalibrator):
                 process.wait(timeout=5)
             except subprocess.TimeoutExpired:
                 process.kill()
+                process.wait()
             except Exception as e:  # pylint: disable=broad-except
                 logger.error("Failed to terminate calibration process: %s", e)
+            finally:
+                process.stdin.close()
@@ -4,20 +4,175 @@ from dataclasses import dataclass
 from datetime import datetime
 import logging
 import os
-from typing import Dict, Optional
+import time
+from typing import Callable, Dict, Optional
 
 import psutil
 
+from orchestrator.config import _DATACLASS_OPTIONS, SYSTEM_METRICS
+
 logger = logging.getLogger(__name__)
 
+# os.statvfs is unavailable on Windows, where psutil.disk_usage is used instead
+_HAS_STATVFS = hasattr(os, 'statvfs')
+
+# Thresholds used for any that are not given to ResourceMonitor
+DEFAULT_THRESHOLDS = {
+    'cpu_percent': 80.0,
+    'memory_percent': 80.0,
+    'disk_percent': 90.0,
+    'max_processes': 2
+}
+
+# Longest stretch of the monitoring interval while usage is steady
+MAX_INTERVAL_BACKOFF = 4
+# Samples within this relative change of the previous one count as steady
+STABLE_USAGE_CHANGE = 0.05
+# Smallest change that counts as unsteady, so that idle usage near zero can
+# still be steady
+STABLE_USAGE_EPS = 1e-3
 
-@dataclass
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ProcessInfo:
     """Information about a running process."""
     pid: int
     start_time: datetime
     memory_usage: float  # In bytes
     cpu_usage: float  # Percentage
+    proc: Optional[psutil.Process] = None  # Handle reused across updates
+
+
+class _MetricsCache:
+    """System metrics with the time each one was last read."""
+
+    def __init__(
+        self, collection_interval: float,
+        metric_intervals: Optional[Dict[str, float]]
+    ) -> None:
+        """Create an empty cache.
+
+        Args:
+            collection_interval: How long a metric is reused (seconds)
+            metric_intervals: Optional per-metric overrides of
+                collection_interval, keyed by system metric name
+        """
+        self.collection_interval = collection_interval
+        self.metric_intervals = dict(metric_intervals or {})
+        self.values: Dict[str, float] = {}
+        self._sampled: Dict[str, float] = {}
+
+    def refresh(self, read: Callable[[str], float]) -> Dict[str, float]:
+        """Re-read the metrics whose interval has elapsed.
+
+        Args:
+            read: Function reading a metric by name
+
+        Returns:
+            Dictionary of system metrics
+        """
+        now = time.monotonic()
+        for name in SYSTEM_METRICS:
+            interval = self.metric_intervals.get(
+                name, self.collection_interval
+            )
+            sampled = self._sampled.get(name)
+            if sampled is None or now - sampled >= interval:
+                self.values[name] = read(name)
+                self._sampled[name] = now
+        return self.values
+
+
+class _UpdateSchedule:
+    """When process metrics are next updated.
+
+    Every three consecutive steady samples double the interval, up to
+    MAX_INTERVAL_BACKOFF times the monitoring interval. Any larger change or
+    a throttling transition resets it.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """Start the schedule now.
+
+        Args:
+            interval: Monitoring interval while usage changes (seconds)
+        """
+        self.interval = interval
+        # Monotonic so that wall-clock adjustments cannot skip or flood polls
+        self.last_check = time.monotonic()
+        self.backoff = 1
+        self._prev_usage: Optional[float] = None
+        self._stable_streak = 0
+
+    def due(self) -> bool:
+        """Check whether an update is due, and if so start a new interval.
+
+        Returns:
+            True if metrics should be updated now
+        """
+        now = time.monotonic()
+        if now - self.last_check < self.interval * self.backoff:
+            return False
+        self.last_check = now
+        return True
+
+    def record(self, resource_usage: float, changed: bool) -> None:
+        """Adapt the interval to how steady resource usage is.
+
+        Args:
+            resource_usage: Highest usage-to-threshold ratio of this sample
+            changed: Whether throttling was applied or removed
+        """
+        prev = self._prev_usage
+        self._prev_usage = resource_usage
+        if (changed or prev is None or abs(resource_usage - prev) >= max(
+                STABLE_USAGE_CHANGE * prev, STABLE_USAGE_EPS)):
+            self._stable_streak = 0
+            self.backoff = 1
+            return
+
+        self._stable_streak += 1
+        self.backoff = min(
+            MAX_INTERVAL_BACKOFF, 2**(self._stable_streak // 3)
+        )
+
+
+class _CachedDecision:
+    """A can_start_new_process() answer reused for a short time."""
+
+    def __init__(self, ttl: float) -> None:
+        """Create an empty cache.
+
+        Args:
+            ttl: How long an answer is reused (seconds)
+        """
+        self.ttl = ttl
+        self._value: Optional[bool] = None
+        self._time = 0.0
+
+    def get(self) -> Optional[bool]:
+        """Get the cached answer.
+
+        Returns:
+            The answer, or None if there is none or it has expired
+        """
+        if (self._value is not None
+                and time.monotonic() - self._time < self.ttl):
+            return self._value
+        return None
+
+    def set(self, value: bool) -> None:
+        """Cache an answer from now on.
+
+        Args:
+            value: Answer to cache
+        """
+        self._value = value
+        self._time = time.monotonic()
+
+    def clear(self) -> None:
+        """Drop the cached answer."""
+        self._value = None
 
 
 class ResourceMonitor:
@@ -29,86 +184,191 @@ class ResourceMonitor:
         *,
         output_dir: Optional[str] = None,
         monitoring_interval: int = 5,  # seconds
+        collection_interval: float = 1.0,  # seconds
+        metric_intervals: Optional[Dict[str, float]] = None,
+        decision_ttl: float = 0.25,  # seconds
         throttle_threshold: float = 0.9,  # 90% of max
         recovery_threshold: float = 0.7,  # 70% of max
     ) -> None:
         """Initialize resource monitor.
 
         Args:
-            thresholds: Optional resource thresholds
+            thresholds: Optional resource thresholds. Missing entries fall
+                back to DEFAULT_THRESHOLDS.
             output_dir: Output directory to monitor disk usage for
             monitoring_interval: How often to update metrics (seconds)
+            collection_interval: How long collected system metrics are reused
+                before psutil is queried again (seconds)
+            metric_intervals: Optional per-metric overrides of
+                collection_interval, keyed by system metric name
+            decision_ttl: How long a can_start_new_process() answer is reused
+                while no process is added or removed (seconds)
             throttle_threshold: When to start throttling (percentage of max)
             recovery_threshold: When to stop throttling (percentage of max)
+
+        Raises:
+            ValueError: If a usage threshold is not positive
         """
-        self.thresholds = thresholds or {
-            'cpu_percent': 80.0,
-            'memory_percent': 80.0,
-            'disk_percent': 90.0,
-            'max_processes': 2
-        }
+        # Created first because set_thresholds() clears it
+        self._decision = _CachedDecision(decision_ttl)
+        self.set_thresholds(thresholds or {})
         self.output_dir = output_dir or os.getcwd()
-        self.monitoring_interval = monitoring_interval
         self.throttle_threshold = throttle_threshold
         self.recovery_threshold = recovery_threshold
-        self.last_check = datetime.now()
         self.running_processes: Dict[str, ProcessInfo] = {}
+        self._metrics = _MetricsCache(collection_interval, metric_intervals)
+        # Steady usage stretches the monitoring interval
+        self._schedule = _UpdateSchedule(monitoring_interval)
+
+    @property
+    def monitoring_interval(self) -> float:
+        """How often to update metrics while usage changes (seconds)."""
+        return self._schedule.interval
+
+    @monitoring_interval.setter
+    def monitoring_interval(self, interval: float) -> None:
+        self._schedule.interval = interval
+
+    @property
+    def last_check(self) -> float:
+        """time.monotonic() of the last metrics update."""
+        return self._schedule.last_check
+
+    @last_check.setter
+    def last_check(self, last_check: float) -> None:
+        self._schedule.last_check = last_check
+
+    @property
+    def thresholds(self) -> Dict[str, float]:
+        """Resource thresholds.
+
+        Assign a new mapping or call set_thresholds() to change them; usage
+        thresholds changed in place are not picked up.
+        """
+        return self._thresholds
+
+    @thresholds.setter
+    def thresholds(self, thresholds: Dict[str, float]) -> None:
+        self.set_thresholds(thresholds)
+
+    def set_thresholds(self, thresholds: Dict[str, float]) -> None:
+        """Replace the thresholds and clear any throttling.
+
+        Args:
+            thresholds: Resource thresholds. Missing entries fall back to
+                DEFAULT_THRESHOLDS.
+
+        Raises:
+            ValueError: If a usage threshold is not positive
+        """
+        merged = {**DEFAULT_THRESHOLDS, **thresholds}
+        for name in SYSTEM_METRICS:
+            if merged[name] <= 0:
+                raise ValueError(f"Threshold for {name} must be positive")
+        self._thresholds = merged
+        # Throttling only changes max_processes, so the reciprocals of the
+        # usage thresholds hold until the thresholds are replaced
+        self._inv_thresholds = tuple(
+            1.0 / merged[name] for name in SYSTEM_METRICS
+        )
+        self.original_max_processes = merged['max_processes']
         self.throttled = False
-        self.original_max_processes = self.thresholds['max_processes']
+        self._decision.clear()
 
     def get_system_metrics(self) -> Dict[str, float]:
         """Get current system metrics.
 
+        Each metric is cached for its interval from metric_intervals, or
+        collection_interval by default, so that callers checking capacity in
+        quick succession share a single set of psutil reads.
+
         Returns:
-            Dictionary of system metrics
+            Dictionary of system metrics, which callers may modify
         """
-        return {
-            'cpu_percent': psutil.cpu_percent(),
-            'memory_percent': psutil.virtual_memory().percent,
-            'disk_percent': psutil.disk_usage(self.output_dir).percent
-        }
+        return dict(self._metrics.refresh(self._read_metric))
+
+    def _read_metric(self, name: str) -> float:
+        """Read a single system metric from psutil.
+
+        Args:
+            name: Metric name from SYSTEM_METRICS
+
+        Returns:
+            Current metric value (percentage)
+        """
+        if name == 'cpu_percent':
+            return psutil.cpu_percent()
+        if name == 'memory_percent':
+            return psutil.virtual_memory().percent
+        return self._disk_percent()
+
+    def _disk_percent(self) -> float:
+        """Read disk usage for the output directory.
+
+        Calls os.statvfs directly where available, which avoids the overhead
+        of psutil.disk_usage on every poll. The percentage matches psutil's,
+        excluding blocks reserved for root.
+
+        Returns:
+            Disk usage percentage
+        """
+        if not _HAS_STATVFS:
+            return psutil.disk_usage(self.output_dir).percent
+        st = os.statvfs(self.output_dir)
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        total_user = used + st.f_bavail * st.f_frsize
+        if not total_user:
+            return 0.0
+        return round(100.0 * used / total_user, 1)
 
     def update_process_metrics(self) -> None:
         """Update metrics for all running processes."""
-        current_time = datetime.now()
-        if (current_time -
-                self.last_check).total_seconds() < self.monitoring_interval:
+        if not self._schedule.due():
             return
 
-        self.last_check = current_time
         metrics = self.get_system_metrics()
 
         # Check if we need to throttle or can recover
+        inv_cpu, inv_memory, inv_disk = self._inv_thresholds
         resource_usage = max(
-            metrics['cpu_percent'] / self.thresholds['cpu_percent'],
-            metrics['memory_percent'] / self.thresholds['memory_percent'],
-            metrics['disk_percent'] / self.thresholds['disk_percent']
+            metrics['cpu_percent'] * inv_cpu,
+            metrics['memory_percent'] * inv_memory,
+            metrics['disk_percent'] * inv_disk
         )
 
+        throttled = self.throttled
         if not self.throttled and resource_usage > self.throttle_threshold:
             self._apply_throttling(metrics)
         elif self.throttled and resource_usage < self.recovery_threshold:
             self._remove_throttling()
+        self._schedule.record(resource_usage, throttled != self.throttled)
 
-        # Update metrics for each running process
-        for file_id, proc_info in list(self.running_processes.items()):
+        # Update metrics for each running process into a new dict that
+        # replaces the old one in a single assignment, so readers never see
+        # it half-updated
+        updated: Dict[str, ProcessInfo] = {}
+        for file_id, proc_info in self.running_processes.items():
             try:
-                proc = psutil.Process(proc_info.pid)
+                # Reuse the stored handle so cpu_percent() measures the time
+                # since the previous update
+                proc = proc_info.proc or psutil.Process(proc_info.pid)
                 with proc.oneshot():
                     cpu_percent = proc.cpu_percent()
                     memory_info = proc.memory_info()
-                    self.running_processes[file_id] = ProcessInfo(
+                    updated[file_id] = ProcessInfo(
                         pid=proc_info.pid,
                         start_time=proc_info.start_time,
                         memory_usage=memory_info.rss,
-                        cpu_usage=cpu_percent
+                        cpu_usage=cpu_percent,
+                        proc=proc
                     )
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 logger.warning(
                     "Process %d no longer exists or is inaccessible",
                     proc_info.pid
                 )
-                del self.running_processes[file_id]
+                self._decision.clear()
+        self.running_processes = updated
 
     def _apply_throttling(self, metrics: Dict[str, float]) -> None:
         """Apply throttling based on current resource usage."""
@@ -151,25 +411,40 @@ class ResourceMonitor:
     def can_start_new_process(self) -> bool:
         """Check if new process can be started.
 
+        The answer is reused for decision_ttl seconds unless a process is
+        added or removed in the meantime.
+
         Returns:
             True if new process can be started, False otherwise
         """
+        decision = self._decision.get()
+        if decision is None:
+            decision = self._check_capacity()
+            self._decision.set(decision)
+        return decision
+
+    def _check_capacity(self) -> bool:
+        """Check process count and system metrics against the thresholds.
+
+        Returns:
+            True if new process can be started, False otherwise
+        """
+        # A full table is rejected before any psutil read. Throttling is
+        # re-evaluated on the first check after a process is removed.
+        if len(self.running_processes) >= self.thresholds['max_processes']:
+            return False
+
         # Update metrics before making decision
         self.update_process_metrics()
-
         if len(self.running_processes) >= self.thresholds['max_processes']:
             return False
 
         metrics = self.get_system_metrics()
-        resource_checks = {
-            'cpu_percent':
-                metrics['cpu_percent'] < self.thresholds['cpu_percent'],
-            'memory_percent':
-                metrics['memory_percent'] < self.thresholds['memory_percent'],
-            'disk_percent':
-                metrics['disk_percent'] < self.thresholds['disk_percent']
-        }
-        return all(resource_checks.values())
+        if metrics['memory_percent'] >= self.thresholds['memory_percent']:
+            return False
+        if metrics['cpu_percent'] >= self.thresholds['cpu_percent']:
+            return False
+        return metrics['disk_percent'] < self.thresholds['disk_percent']
 
     def add_process(self, file_id: str, process: psutil.Process) -> None:
         """Add a new process to monitor.
@@ -184,8 +459,10 @@ class ResourceMonitor:
                     pid=process.pid,
                     start_time=datetime.now(),
                     memory_usage=process.memory_info().rss,
-                    cpu_usage=process.cpu_percent()
+                    cpu_usage=process.cpu_percent(),
+                    proc=process
                 )
+            self._decision.clear()
         except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
             logger.error(
                 "Failed to add process %d for monitoring: %s", process.pid, e
@@ -199,3 +476,4 @@ class ResourceMonitor:
         """
         if file_id in self.running_processes:
             del self.running_processes[file_id]
+            self._decision.clear()
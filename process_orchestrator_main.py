@@ -9,11 +9,6 @@ import sys
 from orchestrator.config import Config, OrchestratorOptions
 from orchestrator.process_manager import ProcessManager
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 
@@ -85,6 +80,13 @@ def main() -> int:
     """
     try:
         args = parse_args()
+
+        # Configure logging once; basicConfig is a no-op on later calls
+        logging.basicConfig(
+            level=getattr(logging, args.log_level),
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+
         validate_config_file(args.config)
 
         # Load base configuration
@@ -97,11 +99,6 @@ def main() -> int:
             logger.error(str(e))
             return 1
 
-        # Configure logging
-        logging.basicConfig(
-            level=getattr(logging, options.log_level),
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
         logger.info("Output directory: %s", options.output_dir)
 
         # Update config with combined options
@@ -0,0 +1,33 @@
+"""Shared helpers for the test suites."""
+
+import tempfile
+from typing import Callable
+
+
+class FakeProcess:
+    """Minimal stand-in for a running subprocess.Popen."""
+
+    __slots__ = ('returncode',)
+
+    def __init__(self):
+        self.returncode = None
+
+    def poll(self):
+        """Return the exit code, or None while still running."""
+        return self.returncode
+
+
+def temporary_directory(add_cleanup: Callable, **kwargs) -> str:
+    """Create a temporary directory that is removed by a test cleanup.
+
+    Args:
+        add_cleanup: Cleanup registration, such as TestCase.addCleanup or
+            TestCase.addClassCleanup
+        **kwargs: Arguments for tempfile.TemporaryDirectory
+
+    Returns:
+        Path of the directory
+    """
+    tmp = tempfile.TemporaryDirectory(**kwargs)  # pylint: disable=consider-using-with
+    add_cleanup(tmp.cleanup)
+    return tmp.name
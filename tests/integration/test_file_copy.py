@@ -1,17 +1,15 @@
 """Integration tests for file copy functionality."""
 # pylint: disable=duplicate-code
 
-import asyncio
 import os
 import shutil
-import tempfile
-from unittest.mock import MagicMock
 import unittest
 from typing import List
 
 from orchestrator.config import Config, BinaryConfig, DirectoryConfig
 from orchestrator.process_manager import ProcessManager
 from orchestrator.resource_calibration import NoopCalibrator, ProcessCalibrator
+from tests.helpers import FakeProcess, temporary_directory
 
 
 class TestFileCopy(unittest.TestCase):
@@ -52,99 +50,80 @@ class TestFileCopy(unittest.TestCase):
             config, calibrator=calibrator, skip_calibration=skip_calibration
         )
 
-    def setUp(self):
-        """Set up test fixtures."""
-        if self._testMethodName == 'test_nonexistent_file':
-            # Minimal setup for nonexistent file test
-            self.temp_base = tempfile.mkdtemp()
-            self.output_dir = os.path.join(self.temp_base, 'output')
-            os.makedirs(self.output_dir)
-            self.input_list_file = os.path.join(
-                self.temp_base, 'input_files.txt'
-            )
-            with open(self.input_list_file, 'w', encoding='utf-8') as f:
-                f.write('/nonexistent/file.txt\n')
-            self.manager = self._create_process_manager()
-            return
-
-        # Full setup for other tests
-        self.temp_base = tempfile.mkdtemp()
-        self.input_dir = os.path.join(self.temp_base, 'input')
-        self.output_dir = os.path.join(self.temp_base, 'output')
-        os.makedirs(self.input_dir)
-        os.makedirs(self.output_dir)
+    @classmethod
+    def setUpClass(cls):
+        """Create the input files shared by every test."""
+        cls.temp_base = temporary_directory(cls.addClassCleanup)
+        cls.input_dir = os.path.join(cls.temp_base, 'input')
+        os.makedirs(cls.input_dir)
 
         # Create test files
-        self.test_files: List[str] = []
+        cls.test_files: List[str] = []
         for i in range(3):
-            test_file = os.path.join(self.input_dir, f'test_{i}.txt')
+            test_file = os.path.join(cls.input_dir, f'test_{i}.txt')
             with open(test_file, 'w', encoding='utf-8') as f:
                 f.write(f'Test content {i}')
-            self.test_files.append(test_file)
+            cls.test_files.append(test_file)
 
-        # Create a large test file (1MB)
-        self.large_file = os.path.join(self.input_dir, 'large_file.txt')
-        with open(self.large_file, 'wb') as f:
-            f.write(b'0' * 1024 * 1024)
+        # Create a large test file (1MB). Only its size is checked, so a
+        # sparse file avoids writing the data
+        cls.large_file = os.path.join(cls.input_dir, 'large_file.txt')
+        fd = os.open(cls.large_file, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, 1024 * 1024)
+        finally:
+            os.close(fd)
 
         # Create input file list
-        self.input_list_file = os.path.join(self.temp_base, 'input_files.txt')
-        with open(self.input_list_file, 'w', encoding='utf-8') as f:
-            for test_file in self.test_files:
-                f.write(f'{test_file}\n')
-            f.write(f'{self.large_file}\n')
+        cls.input_list_file = os.path.join(cls.temp_base, 'input_files.txt')
+        with open(cls.input_list_file, 'w', encoding='utf-8') as f:
+            f.writelines(
+                f'{path}\n' for path in cls.test_files + [cls.large_file]
+            )
 
-        # Initialize process manager
-        self.manager = self._create_process_manager()
+    def setUp(self):
+        """Set up test fixtures."""
+        # Each test writes to its own output directory
+        self.output_dir = temporary_directory(
+            self.addCleanup, prefix=f'{self._testMethodName}_', dir=self.temp_base
+        )
+        if self._testMethodName != 'test_nonexistent_file':
+            self.manager = self._create_process_manager()
 
-    async def _monitor_process(self, process, input_file, output_file):
+    def _monitor_process(self, process, input_file, output_file):
         """Monitor a process until completion and verify output using mocks."""
         # Mock process completion
-        if isinstance(process.poll, MagicMock):
-            process.poll.return_value = 0
+        process.returncode = 0
 
         # Copy input file to output file to maintain file sizes
         if not os.path.exists(os.path.dirname(output_file)):
             os.makedirs(os.path.dirname(output_file))
-        with open(input_file, 'rb') as src, open(output_file, 'wb') as dst:
-            dst.write(src.read())
+        shutil.copyfile(input_file, output_file)
 
         return True
 
     def test_large_file(self):
         """Test copying a large file."""
+        self.addCleanup(self.manager.close)
         process = self.manager.start_process(self.large_file)
         self.assertIsNotNone(process)
 
-        # Wait for process to complete
+        # Wait for the copy to exit rather than polling for the output file
+        self.assertEqual(process.wait(timeout=10), 0)
         output_file = os.path.join(
             self.output_dir,
             os.path.basename(self.large_file) + '.bak'
         )
-
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        success = loop.run_until_complete(
-            asyncio.wait_for(
-                self._monitor_process(process, self.large_file, output_file),
-                timeout=10
-            )
-        )
-
-        self.assertTrue(success, "Process failed or output file not created")
         self.assertEqual(
             os.path.getsize(output_file), os.path.getsize(self.large_file)
         )
 
     def test_nonexistent_file(self):
         """Test copying a non-existent file."""
-        # Create temp dir just for output path
-        self.temp_base = tempfile.mkdtemp()
-        self.output_dir = os.path.join(self.temp_base, 'output')
-        os.makedirs(self.output_dir)
-
         # Create input file list
-        self.input_list_file = os.path.join(self.temp_base, 'input_files.txt')
+        self.input_list_file = os.path.join(
+            self.output_dir, 'input_files.txt'
+        )
         with open(self.input_list_file, 'w', encoding='utf-8') as f:
             f.write('/nonexistent/file.txt\n')
 
@@ -153,19 +132,17 @@ class TestFileCopy(unittest.TestCase):
         with self.assertRaises(FileNotFoundError):
             self.manager.start_process('/nonexistent/file.txt')
 
-    async def _monitor_all_processes(self, processes, test_files):
+    def _monitor_all_processes(self, processes, test_files):
         """Monitor all processes until completion and verify outputs using mocks."""
-        results = []
-        for process, test_file in zip(processes, test_files):
-            output_file = os.path.join(
-                self.output_dir,
-                os.path.basename(test_file) + '.bak'
-            )
-            result = await self._monitor_process(
-                process, test_file, output_file
-            )
-            results.append(result)
-        return all(results)
+        return all(
+            self._monitor_process(
+                process, test_file,
+                os.path.join(
+                    self.output_dir,
+                    os.path.basename(test_file) + '.bak'
+                )
+            ) for process, test_file in zip(processes, test_files)
+        )
 
     def test_parallel_file_copy(self):
         """Test copying multiple files in parallel."""
@@ -175,20 +152,11 @@ class TestFileCopy(unittest.TestCase):
         processes = []
         for test_file in self.test_files:
             # Mock the process
-            process = MagicMock()
-            process.poll = MagicMock(return_value=None)
-            self.assertIsNotNone(process)
+            process = FakeProcess()
             processes.append(process)
 
         # Wait for all processes to complete
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        success = loop.run_until_complete(
-            asyncio.wait_for(
-                self._monitor_all_processes(processes, self.test_files),
-                timeout=10
-            )
-        )
+        success = self._monitor_all_processes(processes, self.test_files)
 
         self.assertTrue(success, "Not all processes completed successfully")
 
@@ -201,8 +169,3 @@ class TestFileCopy(unittest.TestCase):
             self.assertEqual(
                 os.path.getsize(output_file), os.path.getsize(test_file)
             )
-
-    def tearDown(self):
-        """Clean up test fixtures."""
-        if hasattr(self, 'temp_base'):
-            shutil.rmtree(self.temp_base)
@@ -1,15 +1,15 @@
 """Integration tests for job configuration loading and execution."""
 
-import asyncio
+import filecmp
 import os
-import tempfile
-from unittest.mock import MagicMock
+import shutil
 import unittest
 from typing import List
 
 from orchestrator.config import Config, BinaryConfig, DirectoryConfig
 from orchestrator.process_manager import ProcessManager
 from orchestrator.resource_calibration import NoopCalibrator
+from tests.helpers import FakeProcess, temporary_directory
 
 
 class TestJobConfig(unittest.TestCase):
@@ -17,19 +17,26 @@ class TestJobConfig(unittest.TestCase):
 
     # pylint: disable=duplicate-code
 
+    @classmethod
+    def setUpClass(cls):
+        """Create the input files shared by every test."""
+        cls.test_dir = temporary_directory(cls.addClassCleanup)
+        cls.input_files = cls._create_test_files(['test1.txt', 'test2.txt'])
+        cls.input_list_file = os.path.join(cls.test_dir, 'input_files.txt')
+        cls._create_input_list_file(cls.input_files)
+
     def setUp(self):
         """Set up test fixtures."""
-        self.test_dir = tempfile.mkdtemp()
-        self.input_files = self._create_test_files(['test1.txt', 'test2.txt'])
-        self.input_list_file = os.path.join(self.test_dir, 'input_files.txt')
-        self._create_input_list_file(self.input_files)
-        self.output_dir = os.path.join(self.test_dir, 'output')
-        os.makedirs(self.output_dir)
+        # Each test writes to its own output directory
+        self.output_dir = temporary_directory(
+            self.addCleanup, prefix=f'{self._testMethodName}_', dir=self.test_dir
+        )
 
         # Initialize default manager for tests
         self.manager = None
 
-    def _create_test_files(self, filenames: List[str]) -> List[str]:
+    @classmethod
+    def _create_test_files(cls, filenames: List[str]) -> List[str]:
         """Create test files with content.
 
         Args:
@@ -40,33 +47,31 @@ class TestJobConfig(unittest.TestCase):
         """
         files = []
         for filename in filenames:
-            file_path = os.path.join(self.test_dir, filename)
+            file_path = os.path.join(cls.test_dir, filename)
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(f'Test content for {filename}')
             files.append(file_path)
         return files
 
-    def _create_input_list_file(self, file_paths: List[str]):
+    @classmethod
+    def _create_input_list_file(cls, file_paths: List[str]):
         """Create input list file containing paths to input files.
 
         Args:
             file_paths: List of file paths to include in the list
         """
-        with open(self.input_list_file, 'w', encoding='utf-8') as f:
-            for file_path in file_paths:
-                f.write(f'{file_path}\n')
+        with open(cls.input_list_file, 'w', encoding='utf-8') as f:
+            f.writelines(f'{file_path}\n' for file_path in file_paths)
 
-    async def _monitor_process(self, process, input_file, output_file):
+    def _monitor_process(self, process, input_file, output_file):
         """Monitor a process until completion and verify output using mocks."""
         # Mock process completion
-        if isinstance(process.poll, MagicMock):
-            process.poll.return_value = 0
+        process.returncode = 0
 
         # Copy input file to output file to maintain file sizes
         if not os.path.exists(os.path.dirname(output_file)):
             os.makedirs(os.path.dirname(output_file))
-        with open(input_file, 'rb') as src, open(output_file, 'wb') as dst:
-            dst.write(src.read())
+        shutil.copyfile(input_file, output_file)
 
         return True
 
@@ -100,51 +105,33 @@ class TestJobConfig(unittest.TestCase):
         # Process each test file
         for test_file in self.input_files:
             # Mock the process
-            process = MagicMock()
-            process.poll = MagicMock(return_value=None)
-            self.assertIsNotNone(process)
+            process = FakeProcess()
 
-            # Wait for process to complete
             output_file = os.path.join(
                 self.output_dir, os.path.basename(test_file)
             )
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            success = loop.run_until_complete(
-                asyncio.wait_for(
-                    self._monitor_process(process, test_file, output_file),
-                    timeout=10
-                )
-            )
+            success = self._monitor_process(process, test_file, output_file)
             self.assertTrue(
                 success, "Process failed or output file not created"
             )
-            self.assertEqual(
-                os.path.getsize(output_file), os.path.getsize(test_file)
-            )
+            self.assertTrue(filecmp.cmp(output_file, test_file))
 
     def test_suffix_configurations(self):
         """Test output suffix configuration."""
         manager = self._create_process_manager(output_suffix="_processed")
+        self.addCleanup(manager.close)
 
         # Process a test file
         test_file = self.input_files[0]
         process = manager.start_process(test_file)
         self.assertIsNotNone(process)
 
-        # Wait for process to complete
+        # Wait for the copy to exit rather than polling for the output file
+        self.assertEqual(process.wait(timeout=10), 0)
         output_file = os.path.join(
             self.output_dir,
             os.path.basename(test_file) + "_processed"
         )
-        loop = asyncio.get_event_loop()
-        success = loop.run_until_complete(
-            asyncio.wait_for(
-                self._monitor_process(process, test_file, output_file),
-                timeout=10
-            )
-        )
-        self.assertTrue(success, "Process failed or output file not created")
         self.assertEqual(
             os.path.getsize(output_file), os.path.getsize(test_file)
         )
@@ -196,27 +183,14 @@ class TestJobConfig(unittest.TestCase):
             # Process a test file
             test_file = self.input_files[0]
             # Mock the process
-            process = MagicMock()
-            process.poll = MagicMock(return_value=None)
-            self.assertIsNotNone(process)
+            process = FakeProcess()
 
             # Verify output file exists in correct directory
             output_file = os.path.join(
                 output_dir,
                 os.path.basename(test_file) + f'_bak{i}'
             )
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            success = loop.run_until_complete(
-                asyncio.wait_for(
-                    self._monitor_process(process, test_file, output_file),
-                    timeout=10
-                )
-            )
+            success = self._monitor_process(process, test_file, output_file)
             self.assertTrue(
                 success, "Process failed or output file not created"
             )
-
-    def tearDown(self):
-        """Clean up test fixtures."""
-        os.system(f"rm -rf {self.test_dir}")
@@ -1,10 +1,10 @@
 """Unit tests for configuration module."""
 
 import os
-import tempfile
 import unittest
 
-from orchestrator.config import Config
+from orchestrator.config import BinaryConfig, Config, DirectoryConfig, ResourceConfig
+from tests.helpers import temporary_directory
 
 
 class TestConfig(unittest.TestCase):
@@ -12,7 +12,7 @@ class TestConfig(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures."""
-        self.test_dir = tempfile.mkdtemp()
+        self.test_dir = temporary_directory(self.addCleanup)
         self.input_list_file = os.path.join(self.test_dir, 'input_files.txt')
         self.output_dir = os.path.join(self.test_dir, 'output')
 
@@ -48,11 +48,119 @@ directories:
         self.assertEqual(config.directories.output_dir, self.output_dir)
         self.assertEqual(config.directories.output_suffix, '_processed')
 
+    def test_load_config_reuses_parsed_file(self):
+        """Test that repeated loads return independent configs and pick up
+        changes to the file."""
+        config_path = os.path.join(self.test_dir, 'config.yaml')
+        template = f'''
+binary:
+  path: {{path}}
+  flags:
+    - "{{{{input_file}}}}"
+directories:
+  input_file_list: {self.input_list_file}
+  output_dir: {self.output_dir}
+'''
+        with open(config_path, 'w', encoding='utf-8') as f:
+            f.write(template.format(path='/bin/cp'))
+
+        first = Config.from_yaml(config_path)
+        first.binary.flags.append('--extra')
+        second = Config.from_yaml(config_path)
+        self.assertEqual(second.binary.flags, ['{input_file}'])
+
+        with open(config_path, 'w', encoding='utf-8') as f:
+            f.write(template.format(path='/bin/mv'))
+        stat = os.stat(config_path)
+        os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+        self.assertEqual(Config.from_yaml(config_path).binary.path, '/bin/mv')
+
+    def test_binary_build_command(self):
+        """Test substituting file placeholders into binary flags."""
+        binary = BinaryConfig(
+            path='/bin/cp',
+            flags=['-v', '--in={input_file}', '{output_file}']
+        )
+        self.assertEqual(
+            binary.build_command('in.txt', 'out.txt'),
+            ['/bin/cp', '-v', '--in=in.txt', 'out.txt']
+        )
+        # Without an output file the placeholder is left untouched
+        self.assertEqual(
+            binary.build_command('in.txt'),
+            ['/bin/cp', '-v', '--in=in.txt', '{output_file}']
+        )
+
+    def test_binary_build_command_uses_current_flags(self):
+        """Test that flags changed after construction are used."""
+        binary = BinaryConfig(path='/bin/cp', flags=['{input_file}'])
+        binary.flags.append('{output_file}')
+        self.assertEqual(
+            binary.build_command('in.txt', 'out.txt'),
+            ['/bin/cp', 'in.txt', 'out.txt']
+        )
+
+        binary.flags = ['-v']
+        self.assertEqual(binary.build_command('in.txt'), ['/bin/cp', '-v'])
+
     def test_load_config_missing_file(self):
         """Test loading configuration from non-existent file."""
         with self.assertRaises(FileNotFoundError):
             Config.from_yaml('/nonexistent/config.yaml')
 
+    def test_directory_validation_is_deferred(self):
+        """Test that path checks only run in validate()."""
+        directories = DirectoryConfig(
+            input_file_list=os.path.join(self.test_dir, 'missing.txt'),
+            output_dir=self.output_dir
+        )
+        self.assertFalse(os.path.exists(self.output_dir))
+
+        with self.assertRaises(FileNotFoundError):
+            directories.validate()
+
+        directories.input_file_list = self.input_list_file
+        directories.validate()
+        self.assertTrue(os.path.isdir(self.output_dir))
+
+    def test_invalid_section_type(self):
+        """Test that config sections must be dicts or config objects."""
+        directories = {
+            'input_file_list': self.input_list_file,
+            'output_dir': self.output_dir
+        }
+        with self.assertRaises(TypeError):
+            Config(binary='/bin/cp', directories=directories)
+
+        config = Config(
+            binary=BinaryConfig(path='/bin/cp'),
+            directories=directories,
+            resources=None
+        )
+        self.assertIsInstance(config.directories, DirectoryConfig)
+        self.assertEqual(config.resources.max_processes, 2)
+
+    def test_resource_percent_must_be_positive(self):
+        """Test that zero usage thresholds are rejected."""
+        for name in ('cpu_percent', 'memory_percent', 'disk_percent'):
+            with self.assertRaises(ValueError):
+                ResourceConfig(**{name: 0})
+
+    def test_iter_input_files(self):
+        """Test iterating over the input file list."""
+        with open(self.input_list_file, 'a', encoding='utf-8') as f:
+            f.write('\n  /path/to/file3.txt  \n')
+        directories = DirectoryConfig(
+            input_file_list=self.input_list_file, output_dir=self.output_dir
+        )
+        self.assertEqual(
+            list(directories.iter_input_files()), [
+                '/path/to/file1.txt', '/path/to/file2.txt',
+                '/path/to/file3.txt'
+            ]
+        )
+
     def test_load_config_with_kwargs(self):
         """Test loading configuration with keyword arguments."""
         config = Config(
@@ -74,7 +182,3 @@ directories:
         )
         self.assertEqual(config.directories.output_dir, self.output_dir)
         self.assertEqual(config.directories.output_suffix, '_processed')
-
-    def tearDown(self):
-        """Clean up test fixtures."""
-        os.system(f"rm -rf {self.test_dir}")
@@ -1,9 +1,9 @@
 """Unit tests for the orchestrator module."""
 
 import os
-import tempfile
 import unittest
 from orchestrator.config import Config, BinaryConfig, DirectoryConfig
+from tests.helpers import temporary_directory
 
 
 class TestOrchestrator(unittest.TestCase):
@@ -11,7 +11,7 @@ class TestOrchestrator(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures."""
-        self.test_dir = tempfile.mkdtemp()
+        self.test_dir = temporary_directory(self.addCleanup)
         self.input_list_file = os.path.join(self.test_dir, 'input_files.txt')
         self.output_dir = os.path.join(self.test_dir, 'output')
 
@@ -1,42 +1,56 @@
 """Unit tests for process manager module."""
 
+import io
 import os
-import tempfile
+import subprocess
+import time
 import unittest
-from unittest.mock import patch
-
-import pytest
+from unittest.mock import MagicMock, PropertyMock, patch
 
 from orchestrator.config import Config
-from orchestrator.process_manager import ProcessManager
+from orchestrator.process_manager import (
+    OUTPUT_TAIL_BYTES, OUTPUT_TAIL_LINES, ProcessManager, _OutputTail
+)
 from orchestrator.resource_calibration import NoopCalibrator
+from tests.helpers import temporary_directory
+
+
+def _stub_output(process):
+    """Give a mocked process empty output streams, fresh on every access."""
+    type(process).stdout = PropertyMock(side_effect=io.BytesIO)
+    type(process).stderr = PropertyMock(side_effect=io.BytesIO)
 
 
 class TestProcessManager(unittest.TestCase):
     """Test process manager functionality."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create temporary directory and test files
-        self.test_dir = tempfile.mkdtemp()
-        self.input_list_file = os.path.join(self.test_dir, 'input_files.txt')
-        self.output_dir = os.path.join(self.test_dir, 'output')
-        os.makedirs(self.output_dir)
+    @classmethod
+    def setUpClass(cls):
+        """Create the input files shared by every test."""
+        cls.test_dir = temporary_directory(cls.addClassCleanup)
+        cls.input_list_file = os.path.join(cls.test_dir, 'input_files.txt')
 
         # Create test files and input list
-        self.test_files = []
+        cls.test_files = []
         for i in range(3):
-            test_file = os.path.join(self.test_dir, f'test_{i}.txt')
+            test_file = os.path.join(cls.test_dir, f'test_{i}.txt')
             with open(test_file, 'w', encoding='utf-8') as f:
                 f.write(f'Test content {i}')
-            self.test_files.append(test_file)
+            cls.test_files.append(test_file)
 
-        with open(self.input_list_file, 'w', encoding='utf-8') as f:
-            for test_file in self.test_files:
-                f.write(f'{test_file}\n')
+        with open(cls.input_list_file, 'w', encoding='utf-8') as f:
+            f.writelines(f'{test_file}\n' for test_file in cls.test_files)
+
+    def setUp(self):
+        """Set up test fixtures."""
+        # Each test writes to its own output directory
+        self.output_dir = temporary_directory(
+            self.addCleanup, prefix=f'{self._testMethodName}_', dir=self.test_dir
+        )
 
         # Initialize manager for tests that don't need specific config
         self.manager = self._create_process_manager()
+        self.addCleanup(self.manager.close)
 
     def _create_process_manager(
         self,
@@ -81,6 +95,77 @@ class TestProcessManager(unittest.TestCase):
         self.assertEqual(command, expected)
         self.assertFalse(use_shell)
 
+    def test_command_building_with_field_lookups(self):
+        """Test that index lookups and conversions in flags match str.format."""
+        config = Config(
+            binary={
+                'path': '/usr/bin/test',
+                'flags': ['{input_file[0]}', '{output_file[1]}', '{input_file!r:>3}']
+            },
+            directories={
+                'input_file_list': self.input_list_file,
+                'output_dir': self.output_dir
+            }
+        )
+        manager = ProcessManager(config, calibrator=NoopCalibrator())
+        input_file = self.test_files[0]
+        output_file = os.path.join(self.output_dir, os.path.basename(input_file))
+        command, _ = manager.build_command(input_file)
+        self.assertEqual(
+            command[1:], [
+                flag.format(input_file=input_file, output_file=output_file)
+                for flag in config.binary.flags
+            ]
+        )
+
+    def test_unknown_flag_placeholder_is_rejected(self):
+        """Test that flags naming an unknown placeholder fail up front."""
+        config = Config(
+            binary={'path': '/usr/bin/test', 'flags': ['{input}']},
+            directories={
+                'input_file_list': self.input_list_file,
+                'output_dir': self.output_dir
+            }
+        )
+        with self.assertRaises(ValueError):
+            ProcessManager(config, calibrator=NoopCalibrator())
+
+    def test_start_process_with_bad_flag_lookup(self):
+        """Test that a failing flag lookup fails the file instead of raising."""
+        config = Config(
+            binary={'path': '/usr/bin/test', 'flags': ['{input_file.missing}']},
+            directories={
+                'input_file_list': self.input_list_file,
+                'output_dir': self.output_dir
+            }
+        )
+        manager = ProcessManager(config, calibrator=NoopCalibrator())
+        with patch('subprocess.Popen') as mock_popen:
+            self.assertIsNone(manager.start_process(self.test_files[0]))
+        mock_popen.assert_not_called()
+        self.assertEqual(manager.failed_files, [self.test_files[0]])
+
+    def test_shell_command_building(self):
+        """Test that shell operators in flags produce a shell command."""
+        config = Config(
+            binary={
+                'path': '/bin/cat',
+                'flags': ['{input_file}', '>', '{output_file}']
+            },
+            directories={
+                'input_file_list': self.input_list_file,
+                'output_dir': self.output_dir
+            }
+        )
+        manager = ProcessManager(config, calibrator=NoopCalibrator())
+        input_file = self.test_files[0]
+        command, use_shell = manager.build_command(input_file)
+        output_file = os.path.join(
+            self.output_dir, os.path.basename(input_file)
+        )
+        self.assertEqual(command, f'/bin/cat {input_file} > {output_file}')
+        self.assertTrue(use_shell)
+
     def test_start_process(self):
         """Test starting a process."""
         # Mock subprocess.Popen and psutil.Process
@@ -88,6 +173,7 @@ class TestProcessManager(unittest.TestCase):
              patch('psutil.Process') as mock_psutil_process:
             mock_process = mock_popen.return_value
             mock_process.pid = 12345
+            _stub_output(mock_process)
 
             # Configure psutil.Process mock
             mock_psutil_process_instance = mock_psutil_process.return_value
@@ -104,6 +190,85 @@ class TestProcessManager(unittest.TestCase):
             # Verify psutil.Process was created with correct PID
             mock_psutil_process.assert_called_once_with(12345)
 
+    def test_start_process_without_capture(self):
+        """Test that output is discarded when capture is disabled."""
+        config = Config(
+            binary={'path': '/usr/bin/test', 'capture_output': False},
+            directories={
+                'input_file_list': self.input_list_file,
+                'output_dir': self.output_dir
+            }
+        )
+        manager = ProcessManager(config, calibrator=NoopCalibrator())
+        self.addCleanup(manager.close)
+        with patch('subprocess.Popen') as mock_popen, \
+             patch('psutil.Process'):
+            mock_popen.return_value.pid = 12345
+
+            manager.start_process(self.test_files[0])
+
+            _, kwargs = mock_popen.call_args
+            self.assertEqual(kwargs['stdout'], subprocess.DEVNULL)
+            self.assertEqual(kwargs['stderr'], subprocess.DEVNULL)
+
+    def test_start_process_creates_output_subdirectory(self):
+        """Test that a suffix with a separator gets its directory created."""
+        config = Config(
+            binary={
+                'path': '/bin/cp',
+                'flags': ['{input_file}', '{output_file}']
+            },
+            directories={
+                'input_file_list': self.input_list_file,
+                'output_dir': self.output_dir,
+                'output_suffix': os.path.join('.d', 'result.txt')
+            }
+        )
+        manager = ProcessManager(config, calibrator=NoopCalibrator())
+        self.addCleanup(manager.close)
+        with patch('subprocess.Popen') as mock_popen, \
+             patch('psutil.Process'):
+            mock_popen.return_value.pid = 12345
+            _stub_output(mock_popen.return_value)
+            manager.start_process(self.test_files[0])
+
+        self.assertTrue(
+            os.path.isdir(
+                os.path.join(
+                    self.output_dir,
+                    os.path.basename(self.test_files[0]) + '.d'
+                )
+            )
+        )
+
+    def test_output_tail_is_bounded(self):
+        """Test that only the trailing lines of process output are kept."""
+        lines = [f'line {i}\n'.encode() for i in range(OUTPUT_TAIL_LINES + 50)]
+        tail = _OutputTail(io.BytesIO(b''.join(lines)))
+        self.assertEqual(
+            tail.read(), b''.join(lines[-OUTPUT_TAIL_LINES:]).decode()
+        )
+
+    def test_output_tail_bounds_unterminated_lines(self):
+        """Test that progress output without newlines is bounded in bytes."""
+        output = b''.join(f'frame={i}\r'.encode() for i in range(50000))
+        tail = _OutputTail(io.BytesIO(output))
+        self.assertEqual(
+            tail.read(), output[-OUTPUT_TAIL_BYTES:].decode()
+        )
+
+    def test_output_tail_closes_pipe(self):
+        """Test that the pipe is closed once it has been drained."""
+        pipe = io.BytesIO(b'output\n')
+        tail = _OutputTail(pipe)
+        self.assertEqual(tail.read(), 'output\n')
+        self.assertTrue(pipe.closed)
+
+    def test_output_tail_replaces_undecodable_bytes(self):
+        """Test that non-UTF-8 output does not stop the drain."""
+        tail = _OutputTail(io.BytesIO(b'bad \xff byte\nnext line\n'))
+        self.assertEqual(tail.read(), 'bad \ufffd byte\nnext line\n')
+
     def test_start_process_nonexistent_file(self):
         """Test starting a process with non-existent file."""
         manager = self._create_process_manager()
@@ -115,17 +280,19 @@ class TestProcessManager(unittest.TestCase):
         # Create manager with calibration skipped
         self.manager = self._create_process_manager(skip_calibration=True)
 
-        # Mock subprocess.Popen and psutil.Process
+        # Mock subprocess.Popen and psutil.Process; the fake pid must not be
+        # watched through a pidfd, which could belong to a real process
         with patch('subprocess.Popen') as mock_popen, \
-             patch('psutil.Process') as mock_psutil_process:
+             patch('psutil.Process') as mock_psutil_process, \
+             patch('orchestrator.process_manager._open_pidfd', return_value=None):
             # Configure process mocks
             mock_process = mock_popen.return_value
             mock_process.pid = 12345
+            _stub_output(mock_process)
             # Each file needs: None (running), 0 (success)
             mock_process.poll.side_effect = [None, 0] * len(
                 self.test_files
             )  # Running then success
-            mock_process.communicate.return_value = ('output', '')
 
             # Configure psutil.Process mock
             mock_psutil_process_instance = mock_psutil_process.return_value
@@ -135,6 +302,9 @@ class TestProcessManager(unittest.TestCase):
 
             # Configure resource monitor to allow all processes
             self.manager.resource_monitor.can_start_new_process = lambda: True
+            # Mocked processes only report exit through poll(), so keep the
+            # run loop's wait short
+            self.manager.resource_monitor.monitoring_interval = 0.01
 
             # Run process manager
             exit_code = self.manager.run()
@@ -146,87 +316,196 @@ class TestProcessManager(unittest.TestCase):
             )
             self.assertEqual(len(self.manager.failed_files), 0)
 
-    @pytest.mark.skip(
-        reason="Test needs to be fixed - retry count tracking issue"
-    )
-    def test_run_with_retries(self):
-        """Test running process manager with retries for failed processes."""
-        # Create manager with calibration skipped
+    def test_run_batch_subset(self):
+        """Test running only a subset of the input files."""
         self.manager = self._create_process_manager(skip_calibration=True)
 
-        # Mock subprocess.Popen and psutil.Process
         with patch('subprocess.Popen') as mock_popen, \
-             patch('psutil.Process') as mock_psutil_process:
-            # Configure process mocks
-            mock_process = mock_popen.return_value
-            mock_process.pid = 12345
-            # First process fails twice then succeeds
-            # For each retry, we need: None (running), 1 (fail)
-            # Final success needs: None (running), 0 (success)
-            mock_process.poll.side_effect = [
-                None,
-                1,  # First attempt fails
-                None,
-                1,  # Second attempt fails
-                None,
-                0  # Third attempt succeeds
-            ] + [None, 0] * (
-                len(self.test_files) - 1
-            ) * 3  # Other files succeed (with extra values)
-            # Reset the retry count to ensure we start fresh
-            self.manager.retry_counts = {}
-            mock_process.communicate.return_value = ('output', 'error')
-
-            # Configure psutil.Process mock
-            mock_psutil_process_instance = mock_psutil_process.return_value
-            mock_psutil_process_instance.pid = 12345
-            mock_psutil_process_instance.memory_info.return_value.rss = 1024 * 1024  # 1MB
-            mock_psutil_process_instance.cpu_percent.return_value = 5.0
-
-            # Configure resource monitor to allow all processes
+             patch('psutil.Process'), \
+             patch('orchestrator.process_manager._open_pidfd', return_value=None):
+            mock_popen.return_value.pid = 12345
+            mock_popen.return_value.poll.return_value = 0
+            _stub_output(mock_popen.return_value)
             self.manager.resource_monitor.can_start_new_process = lambda: True
+            self.manager.resource_monitor.monitoring_interval = 0.01
 
-            # Run process manager
-            exit_code = self.manager.run()
+            exit_code = self.manager.run_batch(self.test_files[:2])
 
-            # Verify successful completion with retries
             self.assertEqual(exit_code, 0)
+            self.assertEqual(self.manager.completed_files, self.test_files[:2])
+            self.assertEqual(mock_popen.call_count, 2)
+
+    def test_wait_for_children_wakes_on_exit(self):
+        """Test that waiting returns as soon as a watched child exits."""
+        # pylint: disable=protected-access
+        manager = self._create_process_manager(skip_calibration=True)
+        manager.resource_monitor.monitoring_interval = 60
+
+        process = subprocess.Popen(['true'])  # pylint: disable=consider-using-with
+        manager._watcher.watch(self.test_files[0], process)
+
+        start = time.monotonic()
+        manager._wait_for_children()
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertEqual(process.wait(), 0)
+
+    @unittest.skipUnless(
+        hasattr(os, 'pidfd_open'), "pidfd_open not available"
+    )
+    def test_watch_process_uses_pidfd(self):
+        """Test that children are watched through pidfds where supported."""
+        # pylint: disable=protected-access
+        manager = self._create_process_manager(skip_calibration=True)
+        manager.resource_monitor.monitoring_interval = 60
+
+        process = subprocess.Popen(['sleep', '0.1'])  # pylint: disable=consider-using-with
+        manager._watcher.watch(self.test_files[0], process)
+        pidfd = manager._watcher.pidfds[self.test_files[0]]
+
+        start = time.monotonic()
+        manager._wait_for_children()
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertEqual(process.wait(), 0)
+
+        manager._watcher.close()
+        self.assertEqual(manager._watcher.pidfds, {})
+        with self.assertRaises(OSError):
+            os.fstat(pidfd)
+
+    @unittest.skipUnless(
+        hasattr(os, 'pidfd_open'), "pidfd_open not available"
+    )
+    def test_close_releases_pidfds(self):
+        """Test that close() releases the pidfds opened by start_process()."""
+        # pylint: disable=protected-access
+        process = self.manager.start_process(self.test_files[0])
+        self.assertIsNotNone(process)
+        pidfd = self.manager._watcher.pidfds[self.test_files[0]]
+        process.wait()
+
+        self.manager.close()
+        self.assertEqual(self.manager._watcher.pidfds, {})
+        with self.assertRaises(OSError):
+            os.fstat(pidfd)
+
+    @unittest.skipUnless(
+        hasattr(os, 'pidfd_open'), "pidfd_open not available"
+    )
+    def test_only_exited_processes_are_checked(self):
+        """Test that pidfd-watched processes are checked once they exit."""
+        # pylint: disable=protected-access
+        manager = self._create_process_manager(skip_calibration=True)
+        manager.resource_monitor.monitoring_interval = 60
+        input_file = self.test_files[0]
+
+        process = subprocess.Popen(['sleep', '0.1'])  # pylint: disable=consider-using-with
+        manager.processes[input_file] = process
+        manager._watcher.watch(input_file, process)
+        self.assertEqual(manager._watcher.to_check(manager.processes), [])
+
+        manager._wait_for_children()
+        self.assertEqual(
+            manager._watcher.to_check(manager.processes), [(input_file, process)]
+        )
+        process.wait()
+        manager._watcher.close()
+
+    @unittest.skipUnless(
+        hasattr(os, 'pidfd_open'), "pidfd_open not available"
+    )
+    def test_timed_out_wait_checks_every_process(self):
+        """Test that a pidfd that never signals cannot starve the checks."""
+        # pylint: disable=protected-access
+        manager = self._create_process_manager(skip_calibration=True)
+        manager.resource_monitor.monitoring_interval = 0.01
+        input_file = self.test_files[0]
+
+        process = subprocess.Popen(['sleep', '30'])  # pylint: disable=consider-using-with
+        try:
+            manager.processes[input_file] = process
+            manager._watcher.watch(input_file, process)
+
+            manager._wait_for_children()
             self.assertEqual(
-                len(self.manager.completed_files), len(self.test_files)
+                manager._watcher.to_check(manager.processes),
+                [(input_file, process)]
             )
-            self.assertEqual(len(self.manager.failed_files), 0)
-            self.assertEqual(self.manager.retry_counts[self.test_files[0]], 2)
+            self.assertEqual(manager._watcher.to_check(manager.processes), [])
+        finally:
+            process.kill()
+            process.wait()
+            manager._watcher.close()
+
+    def test_stop_wakes_run_loop(self):
+        """Test that stop() interrupts a pending wait."""
+        # pylint: disable=protected-access
+        manager = self._create_process_manager(skip_calibration=True)
+        manager.resource_monitor.monitoring_interval = 60
+        manager.stop()
+
+        start = time.monotonic()
+        manager._wait_for_children()
+        self.assertLess(time.monotonic() - start, 10)
+
+    def test_stop_terminates_running_processes(self):
+        """Test that run() terminates and reaps its children when stopped."""
+        config = Config(
+            binary={'path': 'sleep', 'flags': ['30'], 'capture_output': False},
+            directories={
+                'input_file_list': self.input_list_file,
+                'output_dir': self.output_dir
+            }
+        )
+        manager = ProcessManager(config, skip_calibration=True)
+        manager.resource_monitor.can_start_new_process = lambda: True
 
-    @pytest.mark.skip(
-        reason="Test needs to be fixed - retry logic and exit code issues"
-    )
-    def test_run_with_failures(self):
-        """Test running process manager with permanent failures."""
-        # Create manager with calibration skipped
-        self.manager = self._create_process_manager(skip_calibration=True)
+        started = []
+        start_process = manager.start_process
 
-        # Mock subprocess.Popen and psutil.Process
-        with patch('subprocess.Popen') as mock_popen, \
-             patch('psutil.Process') as mock_psutil_process:
-            # Configure process mocks
-            mock_process = mock_popen.return_value
-            mock_process.pid = 12345
-            # First process fails max_retries times
-            # For each retry: None (running), 1 (fail)
-            mock_process.poll.side_effect = [
-                None,
-                1,  # First attempt
-                None,
-                1,  # Second attempt
-                None,
-                1  # Third attempt (max_retries=3)
-            ] + [None, 0] * (
-                len(self.test_files) - 1
-            ) * 3  # Other files succeed (with extra values)
-            # Reset the retry count to ensure we start fresh
-            self.manager.retry_counts = {}
-            mock_process.communicate.return_value = ('output', 'error')
+        def tracking_start(input_file):
+            process = start_process(input_file)
+            started.append(process)
+            if len(started) == len(self.test_files):
+                manager.stop()
+            return process
+
+        manager.start_process = tracking_start
+        start = time.monotonic()
+        manager.run()
+        self.assertLess(time.monotonic() - start, 10)
+
+        self.assertEqual(len(started), len(self.test_files))
+        self.assertEqual(manager.processes, {})
+        for process in started:
+            self.assertIsNotNone(process.poll())
 
+    def _run_with_exit_codes(self, exit_codes):
+        """Run the manager with scripted exit codes for each launch.
+
+        Args:
+            exit_codes: Exit codes of successive launches by input file.
+                Files that are not listed, or run out of codes, succeed.
+
+        Returns:
+            Tuple of run() exit code and the input file of every launch
+        """
+        launches = []
+
+        def popen(command, **_kwargs):
+            input_file = command[1][len('--input='):]
+            launches.append(input_file)
+            codes = exit_codes.get(input_file, [])
+            process = MagicMock()
+            process.pid = 12345
+            _stub_output(process)
+            process.poll.return_value = codes.pop(0) if codes else 0
+            return process
+
+        # The fake pid must not be watched through a pidfd, which could
+        # belong to a real process
+        with patch('subprocess.Popen', side_effect=popen), \
+             patch('psutil.Process') as mock_psutil_process, \
+             patch('orchestrator.process_manager._open_pidfd', return_value=None):
             # Configure psutil.Process mock
             mock_psutil_process_instance = mock_psutil_process.return_value
             mock_psutil_process_instance.pid = 12345
@@ -235,14 +514,54 @@ class TestProcessManager(unittest.TestCase):
 
             # Configure resource monitor to allow all processes
             self.manager.resource_monitor.can_start_new_process = lambda: True
+            # Mocked processes only report exit through poll(), so keep the
+            # run loop's wait short
+            self.manager.resource_monitor.monitoring_interval = 0.01
 
-            # Run process manager
-            exit_code = self.manager.run()
+            return self.manager.run(), launches
 
-            # Verify failure handling
-            self.assertEqual(exit_code, 1)
-            self.assertTrue(len(self.manager.failed_files) > 0)
-            self.assertEqual(
-                self.manager.retry_counts[self.test_files[0]],
-                self.manager.max_retries
-            )
+    def test_run_with_retries(self):
+        """Test running process manager with retries for failed processes."""
+        # Create manager with calibration skipped
+        self.manager = self._create_process_manager(skip_calibration=True)
+
+        # First file fails twice then succeeds
+        exit_code, launches = self._run_with_exit_codes(
+            {self.test_files[0]: [1, 1, 0]}
+        )
+
+        # Verify successful completion with retries
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(
+            sorted(self.manager.completed_files), sorted(self.test_files)
+        )
+        self.assertEqual(self.manager.failed_files, [])
+        self.assertEqual(self.manager.retry_counts[self.test_files[0]], 2)
+        self.assertEqual(launches.count(self.test_files[0]), 3)
+        for test_file in self.test_files[1:]:
+            self.assertEqual(self.manager.retry_counts[test_file], 0)
+            self.assertEqual(launches.count(test_file), 1)
+
+    def test_run_with_failures(self):
+        """Test running process manager with permanent failures."""
+        # Create manager with calibration skipped
+        self.manager = self._create_process_manager(skip_calibration=True)
+
+        # First file fails on every attempt
+        exit_code, launches = self._run_with_exit_codes(
+            {self.test_files[0]: [1] * self.manager.max_retries}
+        )
+
+        # Verify failure handling
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(self.manager.failed_files, [self.test_files[0]])
+        self.assertEqual(
+            sorted(self.manager.completed_files), sorted(self.test_files[1:])
+        )
+        self.assertEqual(
+            self.manager.retry_counts[self.test_files[0]],
+            self.manager.max_retries
+        )
+        self.assertEqual(
+            launches.count(self.test_files[0]), self.manager.max_retries
+        )
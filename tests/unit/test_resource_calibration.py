@@ -1,30 +1,28 @@
 """Unit tests for resource calibration functionality."""
 
 import os
-import shutil
-import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 
 from orchestrator.config import Config
 from orchestrator.process_manager import ProcessManager
-from orchestrator.resource_calibration import ResourceCalibrator, NoopCalibrator, ProcessCalibrator
+from orchestrator.resource_calibration import (
+    CALIBRATION_SAMPLES, ResourceCalibrator, NoopCalibrator, ProcessCalibrator
+)
+from tests.helpers import temporary_directory
 
 
 class TestResourceCalibration(unittest.TestCase):
     """Test resource calibration functionality."""
 
-    def _create_process_manager(
-        self, input_list_file=None, output_dir=None, calibrator=None
-    ):
-        """Create a process manager instance.
+    def _create_config(self, input_list_file=None, output_dir=None):
+        """Create a config that runs /bin/cat on each input file.
 
         Args:
             input_list_file: Optional input list file path. If None, uses self.input_list_file
             output_dir: Optional output directory path. If None, uses self.output_dir
-            calibrator: Optional resource calibrator. If None, uses NoopCalibrator.
         """
-        config = Config(
+        return Config(
             binary={
                 'path': '/bin/cat',  # Use cat for testing
                 'flags': ['{input_file}']
@@ -35,45 +33,53 @@ class TestResourceCalibration(unittest.TestCase):
                 'output_suffix': '.out'
             }
         )
+
+    def _create_calibrator(self):
+        """Create a process calibrator that samples without waiting."""
+        # Samples are taken back to back instead of 0.1s apart
+        return ProcessCalibrator(self._create_config(), sample_interval=0)
+
+    def _create_process_manager(
+        self, input_list_file=None, output_dir=None, calibrator=None
+    ):
+        """Create a process manager instance.
+
+        Args:
+            input_list_file: Optional input list file path. If None, uses self.input_list_file
+            output_dir: Optional output directory path. If None, uses self.output_dir
+            calibrator: Optional resource calibrator. If None, uses NoopCalibrator.
+        """
+        config = self._create_config(input_list_file, output_dir)
         return ProcessManager(config, calibrator=calibrator)
 
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create temporary directory and test files
-        self.test_dir = tempfile.mkdtemp()
-        self.input_dir = os.path.join(self.test_dir, 'input')
-        self.output_dir = os.path.join(self.test_dir, 'output')
-        os.makedirs(self.input_dir)
-        os.makedirs(self.output_dir)
+    @classmethod
+    def setUpClass(cls):
+        """Create the input files shared by every test."""
+        cls.test_dir = temporary_directory(cls.addClassCleanup)
+        cls.input_dir = os.path.join(cls.test_dir, 'input')
+        os.makedirs(cls.input_dir)
 
         # Create test file
-        self.test_file = os.path.join(self.input_dir, 'test.txt')
-        with open(self.test_file, 'w', encoding='utf-8') as f:
+        cls.test_file = os.path.join(cls.input_dir, 'test.txt')
+        with open(cls.test_file, 'w', encoding='utf-8') as f:
             f.write('Test content')
 
         # Create input file list
-        self.input_list_file = os.path.join(self.test_dir, 'input_files.txt')
-        with open(self.input_list_file, 'w', encoding='utf-8') as f:
-            f.write(f'{self.test_file}\n')
+        cls.input_list_file = os.path.join(cls.test_dir, 'input_files.txt')
+        with open(cls.input_list_file, 'w', encoding='utf-8') as f:
+            f.write(f'{cls.test_file}\n')
 
-    def tearDown(self):
-        """Clean up test fixtures."""
-        shutil.rmtree(self.test_dir)
+    def setUp(self):
+        """Set up test fixtures."""
+        # Each test writes to its own output directory
+        self.output_dir = temporary_directory(
+            self.addCleanup, prefix=f'{self._testMethodName}_', dir=self.test_dir
+        )
 
     def test_interface_enforcement(self):
         """Test that ResourceCalibrator interface is enforced."""
         # Create a valid config for testing
-        config = Config(
-            binary={
-                'path': '/bin/cat',
-                'flags': ['{input_file}']
-            },
-            directories={
-                'input_file_list': self.input_list_file,
-                'output_dir': self.output_dir,
-                'output_suffix': '.out'
-            }
-        )
+        config = self._create_config()
 
         # Verify that ResourceCalibrator is an abstract class
         self.assertTrue(hasattr(ResourceCalibrator, '__abstractmethods__'))
@@ -101,6 +107,28 @@ class TestResourceCalibration(unittest.TestCase):
         calibrator = ValidCalibrator(config)
         self.assertIsNotNone(calibrator)
 
+    def test_calibration_process_stays_running(self):
+        """Test that the calibration process is still alive when returned."""
+        config = Config(
+            binary={
+                'path': '/bin/sleep',
+                'flags': ['5']
+            },
+            directories={
+                'input_file_list': self.input_list_file,
+                'output_dir': self.output_dir
+            }
+        )
+        calibrator = ProcessCalibrator(config)
+        process = calibrator.start_process(self.test_file)
+        try:
+            self.assertIsNotNone(process)
+            self.assertIsNone(process.poll())
+        finally:
+            process.kill()
+            process.wait()
+            process.stdin.close()
+
     def test_noop_calibrator(self):
         """Test NoopCalibrator behavior."""
         calibrator = NoopCalibrator()
@@ -121,48 +149,12 @@ class TestResourceCalibration(unittest.TestCase):
             # Mock process resource usage
             mock_process_instance = MagicMock()
             # Simulate stable CPU usage
-            # Provide enough CPU values for all calls:
-            # - Initial stabilization check (up to 10 attempts)
-            # - Final measurement with interval
-            # - Any additional checks
-            mock_process_instance.cpu_percent.side_effect = [
-                50.0,
-                50.5,
-                50.2,
-                50.3,
-                50.1,  # Initial values
-                50.2,
-                50.3,
-                50.1,
-                50.2,
-                50.3,  # More initial values
-                50.1,
-                50.2,
-                50.3,
-                50.1,
-                50.2,  # Final measurement
-                50.1,
-                50.2,
-                50.3,
-                50.1,
-                50.2  # Extra values just in case
-            ]
+            mock_process_instance.cpu_percent.return_value = 50.2
             mock_process_instance.memory_info.return_value.rss = 1024 * 1024 * 1024  # 1GB
             mock_process.return_value = mock_process_instance
 
             # Create calibrator and verify thresholds
-            config = Config(
-                binary={
-                    'path': '/bin/cat',  # Use cat for testing
-                    'flags': ['{input_file}']
-                },
-                directories={
-                    'input_file_list': self.input_list_file,
-                    'output_dir': self.output_dir,
-                    'output_suffix': '.out'
-                }
-            )
-            calibrator = ProcessCalibrator(config)
+            calibrator = self._create_calibrator()
             thresholds = calibrator.calibrate(self.test_file)
 
             # Verify the calculated thresholds
@@ -181,6 +173,14 @@ class TestResourceCalibration(unittest.TestCase):
                 thresholds['max_processes'], 6
             )  # min(6, 12, 7812500000)
 
+            # One priming call, then one per sample, none blocking in psutil
+            self.assertEqual(
+                mock_process_instance.cpu_percent.call_count,
+                CALIBRATION_SAMPLES + 1
+            )
+            for call in mock_process_instance.cpu_percent.call_args_list:
+                self.assertFalse(call.args or call.kwargs.get('interval'))
+
     def test_calibration_memory_constrained(self):
         """Test resource calibration when memory is the constraining factor."""
         with patch('psutil.Process') as mock_process, \
@@ -195,48 +195,12 @@ class TestResourceCalibration(unittest.TestCase):
             # Mock process resource usage
             mock_process_instance = MagicMock()
             # Simulate stable CPU usage
-            # Provide enough CPU values for all calls:
-            # - Initial stabilization check (up to 10 attempts)
-            # - Final measurement with interval
-            # - Any additional checks
-            mock_process_instance.cpu_percent.side_effect = [
-                50.0,
-                50.5,
-                50.2,
-                50.3,
-                50.1,  # Initial values
-                50.2,
-                50.3,
-                50.1,
-                50.2,
-                50.3,  # More initial values
-                50.1,
-                50.2,
-                50.3,
-                50.1,
-                50.2,  # Final measurement
-                50.1,
-                50.2,
-                50.3,
-                50.1,
-                50.2  # Extra values just in case
-            ]
+            mock_process_instance.cpu_percent.return_value = 50.2
             mock_process_instance.memory_info.return_value.rss = 1024 * 1024 * 1024  # 1GB
             mock_process.return_value = mock_process_instance
 
             # Create calibrator and verify thresholds
-            config = Config(
-                binary={
-                    'path': '/bin/cat',  # Use cat for testing
-                    'flags': ['{input_file}']
-                },
-                directories={
-                    'input_file_list': self.input_list_file,
-                    'output_dir': self.output_dir,
-                    'output_suffix': '.out'
-                }
-            )
-            calibrator = ProcessCalibrator(config)
+            calibrator = self._create_calibrator()
             thresholds = calibrator.calibrate(self.test_file)
 
             # Verify the calculated thresholds
@@ -260,61 +224,24 @@ class TestResourceCalibration(unittest.TestCase):
         with patch('psutil.Process') as mock_process, \
              patch('psutil.cpu_count') as mock_cpu_count, \
              patch('psutil.virtual_memory') as mock_virtual_memory, \
-             patch('psutil.disk_usage') as mock_disk_usage:
+             patch('psutil.disk_usage') as mock_disk_usage, \
+             patch('orchestrator.resource_calibration.os.path.getsize') as mock_getsize:
             # Mock system resource info
             mock_cpu_count.return_value = 32
             mock_virtual_memory.return_value.total = 64 * 1024 * 1024 * 1024  # 64GB
             mock_disk_usage.return_value.free = 5 * 1024 * 1024 * 1024  # 5GB
+            # Report a 1GB test file without writing one
+            mock_getsize.return_value = 1024 * 1024 * 1024
 
             # Mock process resource usage
             mock_process_instance = MagicMock()
             # Simulate stable CPU usage
-            # Provide enough CPU values for all calls:
-            # - Initial stabilization check (up to 10 attempts)
-            # - Final measurement with interval
-            # - Any additional checks
-            mock_process_instance.cpu_percent.side_effect = [
-                50.0,
-                50.5,
-                50.2,
-                50.3,
-                50.1,  # Initial values
-                50.2,
-                50.3,
-                50.1,
-                50.2,
-                50.3,  # More initial values
-                50.1,
-                50.2,
-                50.3,
-                50.1,
-                50.2,  # Final measurement
-                50.1,
-                50.2,
-                50.3,
-                50.1,
-                50.2  # Extra values just in case
-            ]
+            mock_process_instance.cpu_percent.return_value = 50.2
             mock_process_instance.memory_info.return_value.rss = 512 * 1024 * 1024  # 512MB
             mock_process.return_value = mock_process_instance
 
-            # Create a 1GB test file
-            with open(self.test_file, 'wb') as f:
-                f.write(b'0' * (1024 * 1024 * 1024))
-
             # Create calibrator and verify thresholds
-            config = Config(
-                binary={
-                    'path': '/bin/cat',  # Use cat for testing
-                    'flags': ['{input_file}']
-                },
-                directories={
-                    'input_file_list': self.input_list_file,
-                    'output_dir': self.output_dir,
-                    'output_suffix': '.out'
-                }
-            )
-            calibrator = ProcessCalibrator(config)
+            calibrator = self._create_calibrator()
             thresholds = calibrator.calibrate(self.test_file)
 
             # Verify the calculated thresholds
@@ -346,25 +273,12 @@ class TestResourceCalibration(unittest.TestCase):
             # Mock process with zero resource usage
             mock_process_instance = MagicMock()
             # Simulate stable CPU usage at zero
-            mock_process_instance.cpu_percent.side_effect = [
-                0.0, 0.1, 0.0, 0.1, 0.0
-            ]
+            mock_process_instance.cpu_percent.return_value = 0.0
             mock_process_instance.memory_info.return_value.rss = 1024  # 1KB
             mock_process.return_value = mock_process_instance
 
             # Create calibrator and verify thresholds
-            config = Config(
-                binary={
-                    'path': '/bin/cat',  # Use cat for testing
-                    'flags': ['{input_file}']
-                },
-                directories={
-                    'input_file_list': self.input_list_file,
-                    'output_dir': self.output_dir,
-                    'output_suffix': '.out'
-                }
-            )
-            calibrator = ProcessCalibrator(config)
+            calibrator = self._create_calibrator()
             thresholds = calibrator.calibrate(self.test_file)
 
             # Verify the calculated thresholds use safe defaults
@@ -380,25 +294,43 @@ class TestResourceCalibration(unittest.TestCase):
             self.assertAlmostEqual(thresholds['disk_percent'], disk_percent)
             self.assertEqual(thresholds['max_processes'], 1)  # min(1, 1024, 78)
 
+    def test_compute_thresholds(self):
+        """Test deriving thresholds directly from measurements."""
+        gb = 1024 * 1024 * 1024
+        thresholds = ProcessCalibrator.compute_thresholds(
+            cpu_percent=50.0,
+            process_memory=gb,
+            output_size=gb,
+            cpu_count=32,
+            total_memory=64 * gb,
+            available_space=5 * gb
+        )
+        self.assertAlmostEqual(thresholds['cpu_percent'], 60.0)
+        self.assertAlmostEqual(thresholds['memory_percent'], 1 / 64 * 120)
+        self.assertAlmostEqual(thresholds['disk_percent'], 1 / 5 * 120)
+        self.assertEqual(thresholds['max_processes'], 4)  # min(25, 51, 4)
+
+        # Unknown CPU count and tiny processes fall back to safe minimums
+        thresholds = ProcessCalibrator.compute_thresholds(
+            cpu_percent=0.0,
+            process_memory=0,
+            output_size=12,
+            cpu_count=None,
+            total_memory=1024,
+            available_space=1024
+        )
+        self.assertEqual(thresholds['cpu_percent'], 1.2)
+        self.assertAlmostEqual(thresholds['memory_percent'], 120.0)
+        self.assertEqual(thresholds['max_processes'], 1)
+
     def test_calibration_no_input_files(self):
         """Test resource calibration when no input files exist."""
         # Create empty input file list
-        empty_list_file = os.path.join(self.test_dir, 'empty_list.txt')
+        empty_list_file = os.path.join(self.output_dir, 'empty_list.txt')
         with open(empty_list_file, 'w', encoding='utf-8') as f:
             f.write('')
 
         # Create calibrator and verify it returns None for no input files
-        config = Config(
-            binary={
-                'path': '/bin/cat',  # Use cat for testing
-                'flags': ['{input_file}']
-            },
-            directories={
-                'input_file_list': empty_list_file,
-                'output_dir': self.output_dir,
-                'output_suffix': '.out'
-            }
-        )
-        calibrator = ProcessCalibrator(config)
+        calibrator = ProcessCalibrator(self._create_config(empty_list_file))
         thresholds = calibrator.calibrate(None)
         self.assertIsNone(thresholds)
@@ -1,10 +1,12 @@
 """Unit tests for resource monitor module."""
 
-from datetime import datetime, timedelta
+from datetime import datetime
+import os
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
-from orchestrator.resource_monitor import ProcessInfo, ResourceMonitor
+from orchestrator.resource_monitor import DEFAULT_THRESHOLDS, ProcessInfo, ResourceMonitor
 
 
 class TestResourceMonitor(unittest.TestCase):
@@ -27,6 +29,7 @@ class TestResourceMonitor(unittest.TestCase):
 
     @patch('psutil.cpu_percent')
     @patch('psutil.virtual_memory')
+    @patch('orchestrator.resource_monitor._HAS_STATVFS', False)
     @patch('psutil.disk_usage')
     def test_get_system_metrics(self, mock_disk, mock_memory, mock_cpu):
         """Test getting system metrics."""
@@ -41,6 +44,67 @@ class TestResourceMonitor(unittest.TestCase):
         self.assertEqual(metrics['memory_percent'], 60.0)
         self.assertEqual(metrics['disk_percent'], 70.0)
 
+    @patch('psutil.cpu_percent')
+    @patch('psutil.virtual_memory')
+    @patch('orchestrator.resource_monitor._HAS_STATVFS', False)
+    @patch('psutil.disk_usage')
+    def test_get_system_metrics_cached(self, mock_disk, mock_memory, mock_cpu):
+        """Test that system metrics are reused within the collection interval."""
+        mock_cpu.return_value = 50.0
+        mock_memory.return_value.percent = 60.0
+        mock_disk.return_value.percent = 70.0
+
+        first = self.monitor.get_system_metrics()
+        second = self.monitor.get_system_metrics()
+
+        self.assertEqual(first, second)
+        mock_cpu.assert_called_once()
+
+        # Callers get their own copy of the cached metrics
+        first['cpu_percent'] = 0.0
+        self.assertEqual(self.monitor.get_system_metrics()['cpu_percent'], 50.0)
+
+        # A zero interval always re-reads the metrics
+        monitor = ResourceMonitor(collection_interval=0)
+        monitor.get_system_metrics()
+        monitor.get_system_metrics()
+        self.assertEqual(mock_cpu.call_count, 3)
+
+    @patch('psutil.cpu_percent')
+    @patch('psutil.virtual_memory')
+    @patch('orchestrator.resource_monitor._HAS_STATVFS', False)
+    @patch('psutil.disk_usage')
+    def test_get_system_metrics_per_metric_interval(
+        self, mock_disk, mock_memory, mock_cpu
+    ):
+        """Test that metrics with their own interval are refreshed separately."""
+        mock_cpu.return_value = 50.0
+        mock_memory.return_value.percent = 60.0
+        mock_disk.return_value.percent = 70.0
+        monitor = ResourceMonitor(
+            collection_interval=0, metric_intervals={'disk_percent': 60.0}
+        )
+
+        monitor.get_system_metrics()
+        monitor.get_system_metrics()
+
+        self.assertEqual(mock_cpu.call_count, 2)
+        self.assertEqual(mock_memory.call_count, 2)
+        mock_disk.assert_called_once()
+
+    @unittest.skipUnless(hasattr(os, 'statvfs'), 'requires os.statvfs')
+    @patch('os.statvfs')
+    def test_disk_percent_from_statvfs(self, mock_statvfs):
+        """Test that disk usage is computed from statvfs like psutil."""
+        mock_statvfs.return_value = MagicMock(
+            f_blocks=1000, f_bfree=400, f_bavail=300, f_frsize=4096
+        )
+        metrics = self.monitor.get_system_metrics()
+
+        # 600 used blocks out of 900 available to unprivileged users
+        self.assertEqual(metrics['disk_percent'], 66.7)
+        mock_statvfs.assert_called_once_with(self.monitor.output_dir)
+
     @patch('orchestrator.resource_monitor.ResourceMonitor.get_system_metrics')
     def test_can_start_new_process_under_threshold(self, mock_metrics):
         """Test capacity check when resources are under thresholds."""
@@ -63,6 +127,47 @@ class TestResourceMonitor(unittest.TestCase):
 
         self.assertFalse(self.monitor.can_start_new_process())
 
+    @patch('psutil.cpu_percent')
+    def test_can_start_new_process_at_capacity(self, mock_cpu):
+        """Test that a full process table is rejected without reading metrics."""
+        for i in range(self.thresholds['max_processes']):
+            mock_process = MagicMock()
+            mock_process.pid = 12345 + i
+            self.monitor.add_process(f'test_file_{i}.txt', mock_process)
+        # Even with a metrics update due
+        self.monitor.last_check = time.monotonic() - 10
+
+        self.assertFalse(self.monitor.can_start_new_process())
+        mock_cpu.assert_not_called()
+
+    @patch('orchestrator.resource_monitor.ResourceMonitor.get_system_metrics')
+    def test_can_start_new_process_cached(self, mock_metrics):
+        """Test that capacity decisions are reused until a process changes."""
+        mock_metrics.return_value = {
+            'cpu_percent': 50.0,
+            'memory_percent': 50.0,
+            'disk_percent': 50.0
+        }
+        monitor = ResourceMonitor(
+            thresholds={
+                **self.thresholds, 'max_processes': 1
+            },
+            decision_ttl=60
+        )
+
+        self.assertTrue(monitor.can_start_new_process())
+        self.assertTrue(monitor.can_start_new_process())
+        mock_metrics.assert_called_once()
+
+        # Adding a process invalidates the cached answer
+        mock_process = MagicMock()
+        mock_process.pid = 12345
+        monitor.add_process('test_file.txt', mock_process)
+        self.assertFalse(monitor.can_start_new_process())
+
+        monitor.remove_process('test_file.txt')
+        self.assertTrue(monitor.can_start_new_process())
+
     @patch('psutil.Process')
     def test_add_and_remove_process(self, mock_process_class):
         """Test adding and removing processes from monitoring."""
@@ -79,11 +184,80 @@ class TestResourceMonitor(unittest.TestCase):
         self.assertEqual(proc_info.pid, 12345)
         self.assertEqual(proc_info.memory_usage, 1024 * 1024)
         self.assertEqual(proc_info.cpu_usage, 10.0)
+        self.assertIs(proc_info.proc, mock_process)
 
         # Test removing process
         self.monitor.remove_process('test_file.txt')
         self.assertNotIn('test_file.txt', self.monitor.running_processes)
 
+    @patch('psutil.Process')
+    @patch('orchestrator.resource_monitor.ResourceMonitor.get_system_metrics')
+    def test_update_reuses_process_handle(self, mock_metrics, mock_process_class):
+        """Test that metric updates reuse the stored psutil handle."""
+        mock_metrics.return_value = {
+            'cpu_percent': 50.0,
+            'memory_percent': 50.0,
+            'disk_percent': 50.0
+        }
+        mock_process = MagicMock()
+        mock_process.pid = 12345
+        mock_process.memory_info.return_value = MagicMock(rss=2048)
+        mock_process.cpu_percent.return_value = 20.0
+        self.monitor.add_process('test_file.txt', mock_process)
+
+        # Force an update
+        self.monitor.last_check = time.monotonic() - 2
+        self.monitor.update_process_metrics()
+
+        mock_process_class.assert_not_called()
+        proc_info = self.monitor.running_processes['test_file.txt']
+        self.assertIs(proc_info.proc, mock_process)
+        self.assertEqual(proc_info.memory_usage, 2048)
+
+    @patch('orchestrator.resource_monitor.ResourceMonitor.get_system_metrics')
+    def test_monitoring_interval_backoff(self, mock_metrics):
+        """Test that steady usage stretches the monitoring interval."""
+        # pylint: disable=protected-access
+        mock_metrics.return_value = {
+            'cpu_percent': 40.0,
+            'memory_percent': 40.0,
+            'disk_percent': 40.0
+        }
+
+        def force_update():
+            self.monitor.last_check = time.monotonic() - 10
+            self.monitor.update_process_metrics()
+
+        for _ in range(4):
+            force_update()
+        self.assertEqual(self.monitor._schedule.backoff, 2)
+        for _ in range(3):
+            force_update()
+        self.assertEqual(self.monitor._schedule.backoff, 4)
+
+        # A large change in usage resets the interval
+        mock_metrics.return_value = {
+            'cpu_percent': 60.0,
+            'memory_percent': 40.0,
+            'disk_percent': 40.0
+        }
+        force_update()
+        self.assertEqual(self.monitor._schedule.backoff, 1)
+
+    @patch('orchestrator.resource_monitor.ResourceMonitor.get_system_metrics')
+    def test_monitoring_interval_backoff_when_idle(self, mock_metrics):
+        """Test that steady zero usage also stretches the monitoring interval."""
+        # pylint: disable=protected-access
+        mock_metrics.return_value = {
+            'cpu_percent': 0.0,
+            'memory_percent': 0.0,
+            'disk_percent': 0.0
+        }
+        for _ in range(4):
+            self.monitor.last_check = time.monotonic() - 10
+            self.monitor.update_process_metrics()
+        self.assertEqual(self.monitor._schedule.backoff, 2)
+
     @patch('orchestrator.resource_monitor.ResourceMonitor.get_system_metrics')
     def test_throttling_activation(self, mock_metrics):
         """Test that throttling activates when resources are high."""
@@ -99,7 +273,7 @@ class TestResourceMonitor(unittest.TestCase):
         }
 
         # Force an update
-        self.monitor.last_check = datetime.now() - timedelta(seconds=2)
+        self.monitor.last_check = time.monotonic() - 2
         self.monitor.update_process_metrics()
 
         # Verify throttling was activated
@@ -124,7 +298,7 @@ class TestResourceMonitor(unittest.TestCase):
         }
 
         # Force an update
-        self.monitor.last_check = datetime.now() - timedelta(seconds=2)
+        self.monitor.last_check = time.monotonic() - 2
         self.monitor.update_process_metrics()
 
         # Verify throttling was removed
@@ -134,6 +308,34 @@ class TestResourceMonitor(unittest.TestCase):
             self.monitor.original_max_processes
         )
 
+    def test_partial_thresholds_use_defaults(self):
+        """Test that missing thresholds fall back to the defaults."""
+        monitor = ResourceMonitor(thresholds={'cpu_percent': 50.0})
+        self.assertEqual(
+            monitor.thresholds, {
+                **DEFAULT_THRESHOLDS, 'cpu_percent': 50.0
+            }
+        )
+
+    def test_non_positive_threshold_rejected(self):
+        """Test that a zero usage threshold is rejected."""
+        with self.assertRaises(ValueError):
+            ResourceMonitor(thresholds={'disk_percent': 0})
+
+    @patch('orchestrator.resource_monitor.ResourceMonitor.get_system_metrics')
+    def test_replaced_thresholds_are_used(self, mock_metrics):
+        """Test that throttling follows thresholds assigned after creation."""
+        mock_metrics.return_value = {
+            'cpu_percent': 50.0,
+            'memory_percent': 50.0,
+            'disk_percent': 50.0
+        }
+        self.monitor.thresholds = {**self.thresholds, 'cpu_percent': 40.0}
+
+        self.monitor.last_check = time.monotonic() - 2
+        self.monitor.update_process_metrics()
+        self.assertTrue(self.monitor.throttled)
+
     @patch('orchestrator.resource_monitor.ResourceMonitor.get_system_metrics')
     def test_process_cleanup(self, mock_metrics):
         """Test that dead processes are cleaned up during metrics update."""
@@ -153,7 +355,7 @@ class TestResourceMonitor(unittest.TestCase):
         )
 
         # Force an update
-        self.monitor.last_check = datetime.now() - timedelta(seconds=2)
+        self.monitor.last_check = time.monotonic() - 2
         self.monitor.update_process_metrics()
 
         # Verify the dead process was cleaned up